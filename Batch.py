@@ -0,0 +1,135 @@
+"""
+Generates many Word Search boards at once by spreading them over a pool of
+worker processes. Finished boards are streamed back as soon as they are done.
+
+batch = BatchGenerator([(16, ["Mercury", "Venus"], 1), (20, words, 2)])
+for result in batch:
+    print(result.board, result.solutions)
+print(batch.throughput)
+
+Alex Eidt
+"""
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+from WordSearch import WordSearch
+
+
+# Result of one job. board and solutions are the WordSearch board and solutions,
+# or None if the job failed, in which case error holds the reason.
+BatchResult = namedtuple(
+    "BatchResult",
+    ["index", "size", "words", "seed", "board", "solutions", "error", "elapsed"],
+)
+
+
+def _generate(index, size, words, seed, timeout, options):
+    """
+    Generates a single Word Search board in a worker process.
+
+    Parameters
+        index: Position of the job in the batch
+        size, words: Arguments passed on to WordSearch
+        seed: Seed for the random number generator used to build the board
+        timeout: Maximum number of seconds to spend on the board
+        options: Keyword arguments passed on to WordSearch
+
+    Returns
+        A BatchResult for the job.
+    """
+    start = perf_counter()
+    try:
+        word_search = WordSearch(size, words, timeout=timeout, seed=seed, **options)
+    except (AssertionError, ValueError, TimeoutError) as e:
+        return BatchResult(
+            index, size, words, seed, None, None, str(e), perf_counter() - start
+        )
+
+    return BatchResult(
+        index,
+        size,
+        words,
+        seed,
+        word_search.board,
+        word_search.solutions,
+        None,
+        perf_counter() - start,
+    )
+
+
+class BatchGenerator:
+    """
+    The BatchGenerator builds a list of Word Search boards in a process pool.
+    Iterating over it yields a BatchResult for each job in the order the jobs
+    finish. Once every job is done, throughput holds the number of boards
+    generated per second.
+    """
+
+    def __init__(self, jobs, max_workers=None, timeout=None, **options):
+        """
+        Initializes a BatchGenerator.
+
+        Parameters
+            jobs: List of (size, words, seed) tuples, one for each board.
+            max_workers: Number of worker processes. Default is None (one per CPU).
+            timeout: Maximum number of seconds to spend on each board. Jobs that
+                     take longer fail with a TimeoutError message so that one
+                     infeasible word list does not hold up the batch.
+                     Default is None (no limit).
+            options: Any other keyword arguments are passed on to WordSearch.
+        """
+        self._jobs = list(jobs)
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._options = options
+        self.elapsed = None
+        self.completed = 0
+        self.failed = 0
+
+    def __iter__(self):
+        """
+        Generates every board in the batch, yielding a BatchResult for each job
+        as soon as it finishes. Closing the generator early cancels the jobs
+        that have not started yet.
+        """
+        start = perf_counter()
+        self.completed = self.failed = 0
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _generate, index, size, words, seed, self._timeout, self._options
+                )
+                for index, (size, words, seed) in enumerate(self._jobs)
+            ]
+            try:
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result.error is None:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    yield result
+            finally:
+                # If iteration stops early, the jobs that have not started are
+                # dropped instead of running before the executor shuts down
+                for future in futures:
+                    future.cancel()
+
+        self.elapsed = perf_counter() - start
+
+    @property
+    def throughput(self):
+        """
+        Number of boards successfully generated per second, or None if the
+        batch has not finished.
+        """
+        if not self.elapsed:
+            return None
+        return self.completed / self.elapsed
+
+    def __len__(self):
+        """
+        Returns the number of jobs in the batch.
+        """
+        return len(self._jobs)
@@ -0,0 +1,179 @@
+"""
+Benchmarks Word Search generation across board sizes, word counts and word
+length distributions. For each combination, a number of boards is generated
+from random words and the per-board latency percentiles, evictions and
+re-placed words are reported.
+
+python Benchmark.py
+
+Alex Eidt
+"""
+
+from random import Random
+from time import perf_counter
+from WordDictionary import WordDictionary
+from WordSearch import WordSearch
+
+
+# Ranges of word lengths (inclusive) sampled for each distribution. A maximum of
+# None means the longest words that fit on the board.
+DISTRIBUTIONS = {"short": (3, 5), "medium": (4, 8), "long": (7, None)}
+
+
+def percentile(values, p):
+    """
+    Returns the p-th percentile (0-100) of a list of values using the
+    nearest-rank method, or None if the list is empty.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    rank = max(0, -(-len(values) * p // 100) - 1)
+    return values[int(rank)]
+
+
+def benchmark_case(dictionary, size, word_count, distribution, repeat, seed, **options):
+    """
+    Generates repeat boards of one size, word count and word length distribution.
+
+    Parameters
+        dictionary: WordDictionary the words are sampled from
+        size: Size of the boards
+        word_count: Number of words hidden in each board
+        distribution: Name of the word length distribution in DISTRIBUTIONS
+        repeat: Number of boards to generate
+        seed: Seed used to choose the words and generate the boards
+        options: Keyword arguments passed on to WordSearch
+
+    Returns
+        A dictionary with the parameters of the case and its measurements. If
+        the dictionary does not have enough words with lengths that fit the
+        board, no board is generated and "skipped" holds the reason.
+    """
+    min_len, max_len = DISTRIBUTIONS[distribution]
+    max_len = size - 3 if max_len is None else min(max_len, size - 3)
+    rng = Random(seed)
+
+    latencies = []
+    evictions = []
+    replaced = []
+    failures = 0
+    skipped = None
+    for _ in range(repeat):
+        try:
+            words = dictionary.sample(word_count, max_len, rng, min_len)
+        except ValueError as e:
+            skipped = str(e)
+            break
+        start = perf_counter()
+        try:
+            word_search = WordSearch(
+                size, words, seed=rng.getrandbits(32), stats=True, **options
+            )
+        except (ValueError, TimeoutError):
+            failures += 1
+            continue
+        latencies.append(perf_counter() - start)
+        evictions.append(word_search.stats.evictions)
+        replaced.append(word_search.stats.replaced)
+
+    return {
+        "size": size,
+        "words": word_count,
+        "lengths": distribution,
+        "boards": len(latencies),
+        "failures": failures,
+        "p50": percentile(latencies, 50),
+        "p90": percentile(latencies, 90),
+        "p99": percentile(latencies, 99),
+        "max": max(latencies, default=None),
+        "evictions": sum(evictions) / len(evictions) if evictions else None,
+        "replaced": sum(replaced) / len(replaced) if replaced else None,
+        "skipped": skipped,
+    }
+
+
+def benchmark(
+    sizes=(16, 32, 64),
+    word_densities=(0.5, 1.0, 1.5),
+    distributions=("short", "medium", "long"),
+    repeat=20,
+    seed=0,
+    file_name="words.txt",
+    **options,
+):
+    """
+    Runs benchmark_case for every combination of size, word count and word
+    length distribution.
+
+    Parameters
+        sizes: Board sizes to benchmark
+        word_densities: Number of words per board as a multiple of the board size
+        distributions: Names of the word length distributions in DISTRIBUTIONS
+        repeat: Number of boards generated for each combination
+        seed: Seed used to choose the words and generate the boards
+        file_name: Word file the words are sampled from
+        options: Keyword arguments passed on to WordSearch
+
+    Returns
+        A list with the result of each benchmark_case.
+    """
+    dictionary = WordDictionary.load(file_name)
+    results = []
+    for size in sizes:
+        for density in word_densities:
+            for distribution in distributions:
+                results.append(
+                    benchmark_case(
+                        dictionary,
+                        size,
+                        max(1, int(size * density)),
+                        distribution,
+                        repeat,
+                        seed,
+                        **options,
+                    )
+                )
+
+    return results
+
+
+def format_results(results):
+    """
+    Returns the results of benchmark as a table. Latencies are in milliseconds,
+    evictions and re-placed words are averages per board. Skipped cases are
+    listed below the table with their reason.
+    """
+    columns = ["size", "words", "lengths", "boards", "failures"]
+    columns += ["p50", "p90", "p99", "max", "evictions", "replaced"]
+    rows = [columns]
+    for result in results:
+        row = []
+        for column in columns:
+            value = result[column]
+            if value is None:
+                row.append("-")
+            elif column in ("p50", "p90", "p99", "max"):
+                row.append(f"{value * 1000:.1f}")
+            elif isinstance(value, float):
+                row.append(f"{value:.2f}")
+            else:
+                row.append(str(value))
+        rows.append(row)
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(columns))]
+    lines = [
+        "  ".join(value.rjust(width) for value, width in zip(row, widths))
+        for row in rows
+    ]
+    for result in results:
+        if result.get("skipped"):
+            lines.append(
+                f"Skipped size {result['size']}, {result['words']} words, "
+                f"{result['lengths']} lengths: {result['skipped']}"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_results(benchmark()))
@@ -0,0 +1,231 @@
+"""
+Exports WordSearch boards as HTML, LaTeX or plain text files without needing
+the WordBoard GUI (or tkinter).
+
+Each format is produced as a stream of chunks that are written through a single
+buffered file, and any number of boards can be exported into one multi-page
+document:
+
+export(word_search)                              # WordSearch.html
+export([board1, board2], fmt="latex")            # WordSearch.tex, one page each
+export(word_search, fmt="text", directory="out") # out/WordSearch.txt
+
+Alex Eidt
+"""
+
+import os
+from WordSearch import WordSearch
+
+
+EXTENSIONS = {"html": ".html", "latex": ".tex", "text": ".txt"}
+
+# Size of the write buffer used for exported files
+BUFFER_SIZE = 1 << 16
+
+MATHJAX = """\t<script type="text/x-mathjax-config">
+                    MathJax.Hub.Config({tex2jax: {inlineMath: [['$','$'], ['\\\\(','\\\\)']]}});
+                    </script>
+                    <script type="text/javascript"
+                    src="http://cdn.mathjax.org/mathjax/latest/MathJax.js?config=TeX-AMS-MML_HTMLorMML">
+                    </script>\n"""
+
+
+def unique_file_name(directory=".", name="WordSearch", extension=".html"):
+    """
+    Finds a file name that is not used yet in the given directory, following
+    the pattern WordSearch.html, WordSearch1.html, WordSearch2.html, ...
+    The directory is only listed once.
+
+    Parameters
+        directory: Directory the file will be created in. Default is the
+                   current directory.
+        name: Name of the file without the number and extension.
+        extension: Extension of the file including the dot.
+
+    Returns
+        The path of the first unused file name.
+    """
+    taken = set()
+    for file_name in os.listdir(directory):
+        stem, ext = os.path.splitext(file_name)
+        if ext != extension or not stem.startswith(name):
+            continue
+        number = stem[len(name) :]
+        if not number:
+            taken.add(0)
+        elif number.isdigit() and not number.startswith("0"):
+            taken.add(int(number))
+
+    number = 0
+    while number in taken:
+        number += 1
+
+    return os.path.join(directory, f"{name}{number or ''}{extension}")
+
+
+def _solution_board(word_search):
+    """
+    Returns the board of a WordSearch with every letter that is not part of a
+    hidden word replaced by an empty string.
+    """
+    solutions = word_search.solutions
+    return [
+        [letter if solutions.covered(x, y) else "" for x, letter in enumerate(row)]
+        for y, row in enumerate(word_search.board)
+    ]
+
+
+def _latex_matrix(board):
+    """
+    Returns the board as a LaTeX matrix.
+    """
+    rows = " \\\\ ".join([" & ".join(row) for row in board])
+    return f"\\begin{{matrix}}{rows}\\end{{matrix}}"
+
+
+def _html_chunks(word_search):
+    """
+    Yields the HTML page for a single WordSearch containing the board as a
+    HTML table, a LaTeX matrix and a string, followed by the solution, the
+    words and the size of the board.
+    """
+    board = word_search.board
+    size = len(word_search)
+
+    yield '<h2 align="center">HTML Table WordSearch Grid:</h2>\n<br><br>'
+
+    # Create HTML Table Version of the Word Search Grid
+    yield '<table align="center">\n'
+    for row in board:
+        yield "\t<tr>\n\t\t"
+        yield "".join([f"<td padding=1em>{letter}</td>" for letter in row])
+        yield "\t</tr>\n"
+    yield "</table>\n<br><br>"
+
+    # Create LaTeX Matrix of the Word Search Grid
+    yield '<h2 align="center">Latex WordSearch Grid:</h2>\n<br><br>'
+    yield _latex_matrix(board)
+    yield "\n<br><br>"
+
+    # Create String Version of Word Search Grid. Each Row separated by ':::'
+    yield '<h2 align="center">WordSearch Grid as String:</h2>\n<br><br>'
+    yield '<div align="center">\n'
+    yield " ::: ".join(["".join(row) for row in board])
+    yield "\n<br><br>\n"
+    yield "\n".join(["".join(row) for row in board])
+    yield "</div>\n"
+
+    # Add solution to the bottom of the page
+    yield '\n<br><br><h2 align="center">Solution</h2><br><br>\n'
+    yield _latex_matrix(_solution_board(word_search))
+
+    # Add words used in the Word Search and the size of the board
+    yield '\n<br><br><h2 align="center">Words</h2><br><br>\n'
+    yield f"""<ul align="center"><li>{'</li><li>'.join(sorted(word_search.solutions))}</li></ul>\n"""
+    yield f'\n<br><br><h2 align="center">SIZE: {size}x{size}</h2><br><br>\n'
+
+
+def _html_document(word_searches):
+    """
+    Yields a HTML document with one page per WordSearch.
+    """
+    yield "<!DOCTYPE html>\n"
+    yield "<html>\n"
+    yield "<head>\n"
+    yield "\t<title>Word Search</title>\n"
+    # Scripts required to display LaTeX
+    yield MATHJAX
+    yield "</head>\n"
+    for i, word_search in enumerate(word_searches):
+        if i:
+            yield '<div style="page-break-before: always"></div>\n'
+        yield from _html_chunks(word_search)
+    yield "</html>"
+
+
+def _latex_document(word_searches):
+    """
+    Yields a LaTeX document with one page per WordSearch containing the board,
+    the words and the solution.
+    """
+    yield "\\documentclass{article}\n"
+    yield "\\usepackage{amsmath}\n"
+    yield "\\begin{document}\n"
+    for i, word_search in enumerate(word_searches):
+        size = len(word_search)
+        if i:
+            yield "\\newpage\n"
+        yield f"\\section*{{Word Search ({size}x{size})}}\n"
+        yield "\\[\n"
+        yield _latex_matrix(word_search.board)
+        yield "\n\\]\n"
+        yield "\\subsection*{Words}\n"
+        yield ", ".join(sorted(word_search.solutions))
+        yield "\n\\subsection*{Solution}\n"
+        yield "\\[\n"
+        yield _latex_matrix(_solution_board(word_search))
+        yield "\n\\]\n"
+    yield "\\end{document}\n"
+
+
+def _text_document(word_searches):
+    """
+    Yields a plain text document with one page per WordSearch containing the
+    board, the words and the solution. Pages are separated by form feeds.
+    """
+    for i, word_search in enumerate(word_searches):
+        if i:
+            yield "\f\n"
+        yield str(word_search)
+        yield "\n\nWords: "
+        yield ", ".join(sorted(word_search.solutions))
+        yield "\n\nSolution:\n"
+        yield "\n".join(
+            [
+                " ".join([letter or "." for letter in row])
+                for row in _solution_board(word_search)
+            ]
+        )
+        yield "\n"
+
+
+DOCUMENTS = {"html": _html_document, "latex": _latex_document, "text": _text_document}
+
+
+def export(word_searches, fmt="html", file_name=None, directory="."):
+    """
+    Exports one or more WordSearch boards into a single file.
+
+    Parameters
+        word_searches: A WordSearch or a list of WordSearch instances. Each board
+                       gets its own page.
+        fmt: One of "html", "latex" or "text". Default is "html".
+        file_name: Path of the file to write. Default is None, which picks
+                   the first unused WordSearchN file name in directory.
+        directory: Directory to write to when file_name is None. Default is the
+                   current directory.
+
+    Returns
+        The path of the file that was written.
+    """
+    if fmt not in DOCUMENTS:
+        raise ValueError(f"Unknown export format {fmt!r}.")
+    if isinstance(word_searches, WordSearch):
+        word_searches = [word_searches]
+
+    if file_name is None:
+        file_name = unique_file_name(directory, extension=EXTENSIONS[fmt])
+        # Another process may have taken the name since the directory was listed
+        while True:
+            try:
+                f = open(file_name, mode="x", buffering=BUFFER_SIZE)
+                break
+            except FileExistsError:
+                file_name = unique_file_name(directory, extension=EXTENSIONS[fmt])
+    else:
+        f = open(file_name, mode="w", buffering=BUFFER_SIZE)
+
+    with f:
+        f.writelines(DOCUMENTS[fmt](word_searches))
+
+    return file_name
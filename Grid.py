@@ -0,0 +1,765 @@
+"""
+Storage backends for the letters of a WordSearch board.
+
+ListGrid keeps the board as a list of lists of letters (None for empty cells).
+ArrayGrid keeps the board as a NumPy uint8 array with EMPTY marking empty cells,
+which lets fit checks, clearing and filling run on whole slices of the board at
+once. ArrayGrid is only available if NumPy is installed.
+BitboardGrid keeps one bitboard (an int with bit y * size + x per cell) for each
+letter and one for the empty cells, so every feasible start of a word in one
+direction is found with one shift and AND per letter.
+
+All backends offer the same methods, so WordSearch can use any of them.
+
+Alex Eidt
+"""
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Value of an empty cell in an ArrayGrid
+EMPTY = 0
+
+# Number of bits of the chunks bitboards are read in
+CHUNK_BITS = 64
+
+# Number of bits of the blocks counted at once when skipping bits
+SKIP_BITS = 4096
+
+
+# int.bit_count is only available from Python 3.10
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+
+    def popcount(bits):
+        """
+        Returns the number of set bits of a non-negative int.
+        """
+        return bin(bits).count("1")
+
+
+class ListGrid:
+    """
+    A square board of letters stored as a list of lists.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes an empty size x size ListGrid.
+
+        Parameters
+            size: Length of one side of the board
+        """
+        self._size = size
+        self._rows = [[None for _ in range(size)] for _ in range(size)]
+
+    def get(self, x, y):
+        """
+        Returns the letter at (x, y) or None if the cell is empty.
+        """
+        return self._rows[y][x]
+
+    def set(self, x, y, letter):
+        """
+        Sets the letter at (x, y). A letter of None empties the cell.
+        """
+        self._rows[y][x] = letter
+
+    def clear(self):
+        """
+        Empties every cell of the board.
+        """
+        for row in self._rows:
+            for j in range(self._size):
+                row[j] = None
+
+    def fits(self, word, x, y, ox, oy):
+        """
+        Determines if a word can be placed starting at (x, y) with step
+        size (ox, oy), i.e. every cell it would cover is either empty or
+        already holds the same letter.
+        """
+        return self.overlap(word, x, y, ox, oy) >= 0
+
+    def overlap(self, word, x, y, ox, oy):
+        """
+        Counts the letters a word placed starting at (x, y) with step size
+        (ox, oy) would share with the letters already on the board.
+
+        Returns
+            The number of shared letters, or -1 if the word does not fit.
+        """
+        shared = 0
+        for i, letter in enumerate(word):
+            current = self._rows[y + i * oy][x + i * ox]
+            if current:
+                if current != letter:
+                    return -1
+                shared += 1
+
+        return shared
+
+    def candidates(self, word, orientations, scored=False):
+        """
+        Finds every placement of a word that fits on the board.
+
+        Parameters
+            word: The word that the placements are being found for
+            orientations: List of (ox, oy, xs, ys) tuples as returned by
+                          WordSearch._get_orientations
+            scored: If True, the number of letters each placement shares with
+                    the board is counted while checking that it fits.
+
+        Returns
+            A list of (x, y, ox, oy) tuples, or of (overlap, x, y, ox, oy)
+            tuples if scored is True.
+        """
+        candidates = []
+        for ox, oy, xs, ys in orientations:
+            for y in ys:
+                for x in xs:
+                    shared = self.overlap(word, x, y, ox, oy)
+                    if shared < 0:
+                        continue
+                    if scored:
+                        candidates.append((shared, x, y, ox, oy))
+                    else:
+                        candidates.append((x, y, ox, oy))
+
+        return candidates
+
+    def fill(self, rng):
+        """
+        Fills all empty cells of the board with random letters.
+
+        Parameters
+            rng: random.Random instance used to pick the letters
+        """
+        for row in self._rows:
+            for j in range(self._size):
+                if not row[j]:
+                    row[j] = rng.choice(LETTERS)
+
+    def paste(self, x, y, rows):
+        """
+        Writes a block of letters onto the board with its top left corner at
+        (x, y). Letters of None empty their cells.
+
+        Parameters
+            x, y: Coordinates of the top left corner of the block
+            rows: The block as a list of lists of letters
+        """
+        for i, row in enumerate(rows):
+            self._rows[y + i][x : x + len(row)] = row
+
+    def rows(self):
+        """
+        Returns the board as a list of lists of letters.
+        """
+        return self._rows
+
+
+class ArrayGrid:
+    """
+    A square board of letters stored as a NumPy uint8 array, where each letter
+    is stored as its character code and empty cells hold EMPTY.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes an empty size x size ArrayGrid.
+
+        Parameters
+            size: Length of one side of the board
+        """
+        if np is None:
+            raise ImportError("NumPy is required for the numpy board backend.")
+        self._size = size
+        self._cells = np.full((size, size), EMPTY, dtype=np.uint8)
+        # List of lists view of the board, rebuilt after the board changes
+        self._rows = None
+
+    @staticmethod
+    def supports(words):
+        """
+        Returns True if every letter of the given words can be stored in a uint8
+        cell, False otherwise.
+        """
+        return all(0 < ord(letter) < 256 for word in words for letter in word)
+
+    def get(self, x, y):
+        """
+        Returns the letter at (x, y) or None if the cell is empty.
+        """
+        code = self._cells[y, x]
+        return chr(code) if code != EMPTY else None
+
+    def set(self, x, y, letter):
+        """
+        Sets the letter at (x, y). A letter of None empties the cell.
+        """
+        self._cells[y, x] = ord(letter) if letter else EMPTY
+        self._rows = None
+
+    def clear(self):
+        """
+        Empties every cell of the board.
+        """
+        self._cells.fill(EMPTY)
+        self._rows = None
+
+    def fits(self, word, x, y, ox, oy):
+        """
+        Determines if a word can be placed starting at (x, y) with step
+        size (ox, oy), i.e. every cell it would cover is either empty or
+        already holds the same letter.
+        """
+        steps = np.arange(len(word))
+        cells = self._cells[y + steps * oy, x + steps * ox]
+        codes = np.frombuffer(word.encode("latin-1"), dtype=np.uint8)
+        return bool(np.all((cells == EMPTY) | (cells == codes)))
+
+    def candidates(self, word, orientations, scored=False):
+        """
+        Finds every placement of a word that fits on the board. For each
+        orientation, every starting point is checked at once by comparing
+        one shifted slice of the board per letter.
+
+        Parameters
+            word: The word that the placements are being found for
+            orientations: List of (ox, oy, xs, ys) tuples as returned by
+                          WordSearch._get_orientations
+            scored: If True, the number of letters each placement shares with
+                    the board is counted from the same slices.
+
+        Returns
+            A list of (x, y, ox, oy) tuples, or of (overlap, x, y, ox, oy)
+            tuples if scored is True.
+        """
+        candidates = []
+        for ox, oy, xs, ys in orientations:
+            if not xs or not ys:
+                continue
+            fit = np.ones((len(ys), len(xs)), dtype=bool)
+            shared = np.zeros((len(ys), len(xs)), dtype=np.int16)
+            for i, letter in enumerate(word):
+                cells = self._cells[
+                    ys.start + i * oy : ys.stop + i * oy,
+                    xs.start + i * ox : xs.stop + i * ox,
+                ]
+                same = cells == ord(letter)
+                fit &= (cells == EMPTY) | same
+                if scored:
+                    shared += same
+            y_index, x_index = np.nonzero(fit)
+            starts = zip((x_index + xs.start).tolist(), (y_index + ys.start).tolist())
+            if scored:
+                candidates.extend(
+                    (overlap, x, y, ox, oy)
+                    for overlap, (x, y) in zip(shared[fit].tolist(), starts)
+                )
+            else:
+                candidates.extend((x, y, ox, oy) for x, y in starts)
+
+        return candidates
+
+    def fill(self, rng):
+        """
+        Fills all empty cells of the board with random letters.
+
+        Parameters
+            rng: random.Random instance used to pick the letters
+        """
+        empty = self._cells == EMPTY
+        generator = np.random.default_rng(rng.getrandbits(64))
+        self._cells[empty] = generator.integers(
+            ord("A"), ord("Z") + 1, size=int(empty.sum()), dtype=np.uint8
+        )
+        self._rows = None
+
+    def paste(self, x, y, rows):
+        """
+        Writes a block of letters onto the board with its top left corner at
+        (x, y). Letters of None empty their cells.
+
+        Parameters
+            x, y: Coordinates of the top left corner of the block
+            rows: The block as a list of lists of letters
+        """
+        if not rows:
+            return
+        codes = np.array(
+            [[ord(letter) if letter else EMPTY for letter in row] for row in rows],
+            dtype=np.uint8,
+        )
+        self._cells[y : y + len(rows), x : x + len(rows[0])] = codes
+        self._rows = None
+
+    def rows(self):
+        """
+        Returns the board as a list of lists of letters.
+        """
+        if self._rows is None:
+            self._rows = [
+                [chr(code) if code != EMPTY else None for code in row]
+                for row in self._cells.tolist()
+            ]
+        return self._rows
+
+
+class BitboardGrid:
+    """
+    A square board of letters stored as a flat list of letters together with
+    bitboards: for each letter, an int with bit y * size + x set for every cell
+    holding that letter, and an int with the bits of the empty cells set. The
+    bitboards are updated as each cell is set, and rebuilt from the letters
+    after blocks of cells are filled or pasted at once.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes an empty size x size BitboardGrid.
+
+        Parameters
+            size: Length of one side of the board
+        """
+        self._size = size
+        self._cells = [None] * (size * size)
+        # Maps each letter on the board to its bitboard
+        self._letters = {}
+        self._empty = (1 << (size * size)) - 1
+        # True if the bitboards no longer match the letters, see _rebuild
+        self._stale = False
+        # List of lists view of the board, rebuilt after the board changes
+        self._rows = None
+
+    def get(self, x, y):
+        """
+        Returns the letter at (x, y) or None if the cell is empty.
+        """
+        return self._cells[y * self._size + x]
+
+    def _rebuild(self):
+        """
+        Rebuilds the bitboards from the letters. Each bitboard is read from a
+        string of binary digits with one digit per cell, which takes time
+        linear in the number of cells rather than one int update per cell.
+        """
+        # One character per cell, last cell first so it becomes the highest bit
+        text = "".join([letter or "\0" for letter in reversed(self._cells)])
+        characters = set(text)
+        self._letters = {}
+        for character in characters:
+            digits = text.translate(
+                {ord(other): "1" if other == character else "0" for other in characters}
+            )
+            if character == "\0":
+                self._empty = int(digits, 2)
+            else:
+                self._letters[character] = int(digits, 2)
+        if "\0" not in characters:
+            self._empty = 0
+        self._stale = False
+
+    def set(self, x, y, letter):
+        """
+        Sets the letter at (x, y). A letter of None empties the cell.
+        """
+        if self._stale:
+            self._rebuild()
+        index = y * self._size + x
+        bit = 1 << index
+        current = self._cells[index]
+        if current:
+            self._letters[current] &= ~bit
+        else:
+            self._empty &= ~bit
+        if letter:
+            self._letters[letter] = self._letters.get(letter, 0) | bit
+        else:
+            self._empty |= bit
+        self._cells[index] = letter
+        self._rows = None
+
+    def clear(self):
+        """
+        Empties every cell of the board.
+        """
+        self._cells = [None] * (self._size * self._size)
+        self._letters = {}
+        self._empty = (1 << (self._size * self._size)) - 1
+        self._stale = False
+        self._rows = None
+
+    def fits(self, word, x, y, ox, oy):
+        """
+        Determines if a word can be placed starting at (x, y) with step
+        size (ox, oy), i.e. every cell it would cover is either empty or
+        already holds the same letter.
+        """
+        return self.overlap(word, x, y, ox, oy) >= 0
+
+    def overlap(self, word, x, y, ox, oy):
+        """
+        Counts the letters a word placed starting at (x, y) with step size
+        (ox, oy) would share with the letters already on the board.
+
+        Returns
+            The number of shared letters, or -1 if the word does not fit.
+        """
+        shared = 0
+        index = y * self._size + x
+        step = oy * self._size + ox
+        for letter in word:
+            current = self._cells[index]
+            if current:
+                if current != letter:
+                    return -1
+                shared += 1
+            index += step
+
+        return shared
+
+    def candidates(self, word, orientations, scored=False):
+        """
+        Finds every placement of a word that fits on the board. For each
+        orientation, the bitboard of the cells that may hold the i-th letter
+        (empty or the same letter) is shifted back by i steps onto the starting
+        cells and ANDed together, starting from the bitboard of the valid
+        starting cells. The placements are returned in the same order as
+        ListGrid.candidates.
+
+        Parameters
+            word: The word that the placements are being found for
+            orientations: List of (ox, oy, xs, ys) tuples as returned by
+                          WordSearch._get_orientations
+            scored: If True, the number of letters each placement shares with
+                    the board is counted with a bit-sliced counter over the
+                    shifted bitboards of the matching letters.
+
+        Returns
+            A BitboardPlacements sequence of (x, y, ox, oy) tuples, or a
+            ScoredPlacements sequence of (overlap, x, y, ox, oy) tuples if
+            scored is True.
+        """
+        if self._stale:
+            self._rebuild()
+        size = self._size
+        placements = []
+        for ox, oy, xs, ys in orientations:
+            if not xs or not ys:
+                continue
+            step = oy * size + ox
+            fit = start_mask(size, xs, ys)
+            same_letters = []
+            for i, letter in enumerate(word):
+                same = self._letters.get(letter, 0)
+                shift = i * step
+                if shift >= 0:
+                    fit &= (self._empty | same) >> shift
+                    same >>= shift
+                else:
+                    fit &= (self._empty | same) << -shift
+                    same <<= -shift
+                if not fit:
+                    break
+                if scored:
+                    same_letters.append(same)
+            if not fit:
+                continue
+
+            if not scored:
+                placements.append((ox, oy, fit))
+                continue
+
+            # counts[k] holds bit k of the number of shared letters of each start
+            counts = []
+            for same in same_letters:
+                count_bits(counts, same & fit)
+
+            placements.append((ox, oy, fit, counts))
+
+        if not scored:
+            return BitboardPlacements(size, placements)
+        return ScoredPlacements(size, placements)
+
+    def fill(self, rng):
+        """
+        Fills all empty cells of the board with random letters.
+
+        Parameters
+            rng: random.Random instance used to pick the letters
+        """
+        self._cells = [letter or rng.choice(LETTERS) for letter in self._cells]
+        self._stale = True
+        self._rows = None
+
+    def paste(self, x, y, rows):
+        """
+        Writes a block of letters onto the board with its top left corner at
+        (x, y). Letters of None empty their cells.
+
+        Parameters
+            x, y: Coordinates of the top left corner of the block
+            rows: The block as a list of lists of letters
+        """
+        for i, row in enumerate(rows):
+            index = (y + i) * self._size + x
+            self._cells[index : index + len(row)] = row
+        self._stale = True
+        self._rows = None
+
+    def rows(self):
+        """
+        Returns the board as a list of lists of letters.
+        """
+        if self._rows is None:
+            size = self._size
+            self._rows = [self._cells[y * size : (y + 1) * size] for y in range(size)]
+        return self._rows
+
+
+@lru_cache(maxsize=256)
+def start_mask(size, xs, ys):
+    """
+    Returns the bitboard of the cells (x, y) with x in xs and y in ys of a
+    size x size board.
+    """
+    row = ((1 << len(xs)) - 1) << xs.start
+    mask = 0
+    for y in ys:
+        mask |= row << (y * size)
+    return mask
+
+
+def count_bits(counts, bits):
+    """
+    Adds one to the bit-sliced counter of every bit set in a bitboard.
+
+    Parameters
+        counts: List of bitboards, where counts[k] holds bit k of the count of
+                each bit. It is updated in place.
+        bits: Bitboard of the bits to count
+    """
+    for k in range(len(counts)):
+        counts[k], bits = counts[k] ^ bits, counts[k] & bits
+        if not bits:
+            return
+    if bits:
+        counts.append(bits)
+
+
+def _bit_indices(bits, skip=0):
+    """
+    Yields the indices of the set bits of an int in increasing order. The int is
+    converted to bytes once and read in CHUNK_BITS sized chunks, so large
+    bitboards are not shifted once per chunk, and skipped bits are counted a
+    block of SKIP_BITS at a time.
+
+    Parameters
+        bits: The int to read
+        skip: Number of set bits to skip before the first one yielded
+    """
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    step = CHUNK_BITS // 8
+    block_size = SKIP_BITS // 8
+    for start in range(0, len(data), block_size):
+        block = data[start : start + block_size]
+        if skip:
+            count = popcount(int.from_bytes(block, "little"))
+            if skip >= count:
+                skip -= count
+                continue
+        for offset in range(0, len(block), step):
+            chunk = int.from_bytes(block[offset : offset + step], "little")
+            if skip:
+                count = popcount(chunk)
+                if skip >= count:
+                    skip -= count
+                    continue
+            base = (start + offset) * 8
+            while chunk:
+                low = chunk & -chunk
+                chunk ^= low
+                if skip:
+                    skip -= 1
+                    continue
+                yield base + low.bit_length() - 1
+
+
+class BitboardPlacements(Sequence):
+    """
+    The placements of a word found by BitboardGrid.candidates, kept as one
+    bitboard of starting cells per orientation. Its length and any single
+    placement are found without building the list of every placement, so a
+    uniformly random placement is chosen in one step with random.choice.
+    """
+
+    def __init__(self, size, placements):
+        """
+        Initializes a BitboardPlacements.
+
+        Parameters
+            size: Length of one side of the board
+            placements: List of (ox, oy, starts) tuples, where starts is the
+                        bitboard of the starting cells that fit
+        """
+        self._size = size
+        self._placements = [
+            (ox, oy, starts, popcount(starts)) for ox, oy, starts in placements
+        ]
+        self._length = sum(count for *_, count in self._placements)
+
+    def __len__(self):
+        """
+        Returns the number of placements.
+        """
+        return self._length
+
+    def __getitem__(self, index):
+        """
+        Returns the (x, y, ox, oy) placement at an index, in the same order as
+        ListGrid.candidates.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("placement index out of range")
+        for ox, oy, starts, count in self._placements:
+            if index < count:
+                y, x = divmod(next(_bit_indices(starts, index)), self._size)
+                return x, y, ox, oy
+            index -= count
+
+    def __iter__(self):
+        """
+        Iterates over the placements in the same order as ListGrid.candidates.
+        """
+        for ox, oy, starts, _ in self._placements:
+            for index in _bit_indices(starts):
+                y, x = divmod(index, self._size)
+                yield x, y, ox, oy
+
+
+class ScoredPlacements(BitboardPlacements):
+    """
+    The placements of a word found by BitboardGrid.candidates with scored=True.
+    Besides the bitboard of starting cells, each orientation keeps a bit-sliced
+    counter of the letters each start shares with the board, so the placements
+    sharing the most letters are found without reading every placement.
+    """
+
+    def __init__(self, size, placements):
+        """
+        Initializes a ScoredPlacements.
+
+        Parameters
+            size: Length of one side of the board
+            placements: List of (ox, oy, starts, counts) tuples, where starts is
+                        the bitboard of the starting cells that fit and bit k of
+                        the number of shared letters of each start is set in
+                        counts[k]
+        """
+        super().__init__(size, [(ox, oy, starts) for ox, oy, starts, _ in placements])
+        self._counts = [counts for *_, counts in placements]
+
+    @staticmethod
+    def _shared(counts, index):
+        """
+        Returns the number of shared letters of the start with the given index.
+        """
+        return sum(((count >> index) & 1) << k for k, count in enumerate(counts))
+
+    def __getitem__(self, index):
+        """
+        Returns the (overlap, x, y, ox, oy) placement at an index, in the same
+        order as ListGrid.candidates.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("placement index out of range")
+        for (ox, oy, starts, count), counts in zip(self._placements, self._counts):
+            if index < count:
+                start = next(_bit_indices(starts, index))
+                y, x = divmod(start, self._size)
+                return self._shared(counts, start), x, y, ox, oy
+            index -= count
+
+    def __iter__(self):
+        """
+        Iterates over the placements in the same order as ListGrid.candidates.
+        The starts and their counts are read one chunk at a time through bytes.
+        """
+        step = CHUNK_BITS // 8
+        for (ox, oy, starts, _), counts in zip(self._placements, self._counts):
+            # The counts only have bits where starts does, so they fit in as
+            # many bytes
+            length = (starts.bit_length() + 7) // 8
+            data = starts.to_bytes(length, "little")
+            counts = [count.to_bytes(length, "little") for count in counts]
+            for offset in range(0, length, step):
+                chunk = int.from_bytes(data[offset : offset + step], "little")
+                if not chunk:
+                    continue
+                chunk_counts = [
+                    int.from_bytes(count[offset : offset + step], "little")
+                    for count in counts
+                ]
+                base = offset * 8
+                while chunk:
+                    low = chunk & -chunk
+                    chunk ^= low
+                    bit = low.bit_length() - 1
+                    y, x = divmod(base + bit, self._size)
+                    yield self._shared(chunk_counts, bit), x, y, ox, oy
+
+    def most_shared(self):
+        """
+        Returns the placements sharing the most letters with the board as a
+        ScoredPlacements, in the same order. The starts of each orientation with
+        the highest count are found from the top bit of the counter down.
+        """
+        best = []
+        for (ox, oy, starts, _), counts in zip(self._placements, self._counts):
+            shared = 0
+            for k in reversed(range(len(counts))):
+                high = starts & counts[k]
+                if high:
+                    starts = high
+                    shared |= 1 << k
+            best.append((shared, ox, oy, starts, [count & starts for count in counts]))
+
+        most = max(shared for shared, *_ in best)
+        return ScoredPlacements(
+            self._size,
+            [
+                (ox, oy, starts, counts)
+                for shared, ox, oy, starts, counts in best
+                if shared == most
+            ],
+        )
+
+
+def most_shared(candidates):
+    """
+    Returns the scored placements returned by a grid's candidates method that
+    share the most letters with the board, in the same order.
+
+    Parameters
+        candidates: Non-empty list or ScoredPlacements of (overlap, x, y, ox, oy)
+                    tuples
+    """
+    if isinstance(candidates, ScoredPlacements):
+        return candidates.most_shared()
+    most = max(candidate[0] for candidate in candidates)
+    return [candidate for candidate in candidates if candidate[0] == most]
@@ -0,0 +1,248 @@
+"""
+Keeps generated Word Search boards on disk so that asking for the same words,
+size, seed and options again skips generation completely. Pass a PuzzleCache
+(or the path of its directory) to WordSearch or WordBoard:
+
+cache = PuzzleCache("puzzles", max_bytes=64 << 20)
+word_search = WordSearch(16, words, seed=7, cache=cache)
+
+Each board is stored in its own file named after the SHA-256 hash of its
+canonical key, in a compact binary format that is read through mmap:
+
+    header      "WSC1", board size (uint16), number of words (uint32)
+    board       size * size bytes, one 8-bit character code per cell
+    placements  per word: x, y (uint16), dx, dy (int8), length of the word
+                in bytes (uint16), followed by the UTF-8 encoded word
+
+Once the files take up more than max_bytes, the least recently used ones are
+deleted. Reading a board marks its file as used by updating its modification
+time, so several processes can share one cache directory.
+
+Alex Eidt
+"""
+
+import json
+import mmap
+import os
+import struct
+from hashlib import sha256
+
+
+# First bytes of every cache file. Changing the format changes the magic, which
+# also changes every key so that old files are never read.
+MAGIC = b"WSC1"
+
+EXTENSION = ".wsc"
+
+HEADER = struct.Struct("<4sHI")
+PLACEMENT = struct.Struct("<HHbbH")
+
+
+def cache_key(size, words, seed, options):
+    """
+    Computes the key of a board from everything that determines it.
+
+    Parameters
+        size: Size of the board
+        words: List of words. Words are uppercased and deduplicated, so their
+               order and case do not matter.
+        seed: Seed of the board
+        options: Dictionary of the WordSearch options that change the board.
+                 Values must be JSON serializable.
+
+    Returns
+        The key as a hexadecimal SHA-256 digest.
+    """
+    canonical = json.dumps(
+        {
+            "format": MAGIC.decode(),
+            "size": size,
+            "words": sorted(set(map(str.upper, words))),
+            "seed": seed,
+            "options": options,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return sha256(canonical.encode()).hexdigest()
+
+
+class PuzzleCache:
+    """
+    The PuzzleCache stores boards and their solutions in a directory, evicting
+    the least recently used ones once they take up more than max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=64 << 20):
+        """
+        Initializes a PuzzleCache, creating the directory if needed.
+
+        Parameters
+            directory: Directory the boards are stored in
+            max_bytes: Maximum total size of the stored boards in bytes.
+                       Default is 64 MiB.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # Estimate of the total size of the files, recounted when evicting
+        self._total = sum(entry.stat().st_size for entry in self._entries())
+
+    def _path(self, key):
+        """
+        Returns the path of the file for a key.
+        """
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def _entries(self):
+        """
+        Returns a list of the os.DirEntry of every cache file.
+        """
+        with os.scandir(self.directory) as entries:
+            return [
+                entry
+                for entry in entries
+                if entry.name.endswith(EXTENSION) and entry.is_file()
+            ]
+
+    def get(self, key):
+        """
+        Reads a board from the cache.
+
+        Parameters
+            key: Key of the board, see cache_key
+
+        Returns
+            A tuple of the board as a list of lists of letters and a list of
+            (word, x, y, dx, dy) placements, or None if the board is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, mode="rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                layout = self._decode(data)
+            os.utime(path)
+        except (OSError, ValueError, struct.error):
+            # Missing, empty or damaged files are treated as not cached
+            layout = None
+
+        if layout is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return layout
+
+    @staticmethod
+    def _decode(data):
+        """
+        Decodes the contents of a cache file.
+
+        Returns
+            A tuple of the board and the placements, see get.
+
+        Raises
+            ValueError: If the data is not a cache file.
+        """
+        magic, size, count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a puzzle cache file.")
+
+        offset = HEADER.size
+        board = []
+        for _ in range(size):
+            board.append(list(data[offset : offset + size].decode("latin-1")))
+            offset += size
+
+        placements = []
+        for _ in range(count):
+            x, y, dx, dy, length = PLACEMENT.unpack_from(data, offset)
+            offset += PLACEMENT.size
+            word = data[offset : offset + length].decode("utf-8")
+            offset += length
+            placements.append((word, x, y, dx, dy))
+
+        return board, placements
+
+    def put(self, key, board, placements):
+        """
+        Stores a board in the cache. The file is written under a temporary name
+        and renamed, so readers never see a partly written board.
+
+        Parameters
+            key: Key of the board, see cache_key
+            board: The board as a list of lists of letters
+            placements: Iterable of (word, x, y, dx, dy) placements
+
+        Returns
+            True if the board was stored, False if one of its letters does not
+            fit in a byte.
+        """
+        try:
+            cells = "".join(["".join(row) for row in board]).encode("latin-1")
+        except UnicodeEncodeError:
+            return False
+
+        placements = list(placements)
+        chunks = [HEADER.pack(MAGIC, len(board), len(placements)), cells]
+        for word, x, y, dx, dy in placements:
+            encoded = word.encode("utf-8")
+            chunks.append(PLACEMENT.pack(x, y, dx, dy, len(encoded)))
+            chunks.append(encoded)
+        data = b"".join(chunks)
+
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, mode="wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+        self._total += len(data)
+        if self._total > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self):
+        """
+        Deletes the least recently used boards until the total size of the
+        cache is at most max_bytes.
+        """
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        self._total = total
+
+    def clear(self):
+        """
+        Deletes every board in the cache.
+        """
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        self._total = 0
+
+    def __len__(self):
+        """
+        Returns the number of boards in the cache.
+        """
+        return len(self._entries())
@@ -0,0 +1,162 @@
+"""
+Builds WordSearch boards on a background worker thread so that the WordBoard
+GUI never blocks while a board is being generated. A few boards are built
+ahead of time, both for the current words ("Reshuffle") and for new random
+word lists ("New Words"), so that the next board is usually ready the moment
+it is asked for.
+
+Every method is meant to be called from the GUI thread. Results are returned
+as concurrent.futures.Future objects that the GUI can poll. Cancelling a board
+that is already being built stops it, and its Future then holds a
+concurrent.futures.CancelledError.
+
+Alex Eidt
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from WordSearch import WordSearch
+
+
+def _build(size, words, seed, options, template=None, cancel=None):
+    """
+    Builds a WordSearch on the worker thread. If a WordSearch with the same
+    words is given as template, the board is built with template.reshuffle,
+    reusing its prepared words and placement tables.
+
+    Returns
+        A tuple of the words and the WordSearch built from them.
+
+    Raises
+        CancelledError: If cancel is set while the board is being built.
+    """
+    if template is not None:
+        return words, template.reshuffle(seed, cancel)
+    return words, WordSearch(size, words, seed=seed, cancel=cancel, **options)
+
+
+class PuzzleQueue:
+    """
+    The PuzzleQueue generates WordSearch boards in the background and keeps
+    up to depth boards ready for the current words and for new word lists.
+    """
+
+    def __init__(self, size, next_seed, choose_words=None, depth=2, **options):
+        """
+        Initializes a PuzzleQueue.
+
+        Parameters
+            size: Size of the boards
+            next_seed: Function returning the seed for the next board
+            choose_words: Function returning a new list of words, or None if new
+                          word lists should not be prefetched. Default is None.
+            depth: Number of boards kept ready for each kind of request.
+                   Default is 2.
+            options: Keyword arguments passed on to WordSearch
+        """
+        self._size = size
+        self._next_seed = next_seed
+        self._choose_words = choose_words
+        self._depth = depth
+        self._options = options
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # Boards being built for self._words
+        self._words = None
+        self._boards = deque()
+        # Boards being built for new word lists
+        self._new_words = deque()
+        # Maps the Future of each board not yet built to the Event cancelling it
+        self._cancels = {}
+
+    def submit(self, words, seed=None, template=None):
+        """
+        Starts building a board for the given words right away.
+
+        Parameters
+            words: List of words to hide in the board
+            seed: Seed of the board. Default is None, which uses next_seed.
+            template: A WordSearch built from the same words and options, whose
+                      preparation is reused. Default is None.
+
+        Returns
+            A Future of a (words, WordSearch) tuple.
+        """
+        if seed is None:
+            seed = self._next_seed()
+        cancel = Event()
+        future = self._executor.submit(
+            _build, self._size, list(words), seed, self._options, template, cancel
+        )
+        self._cancels[future] = cancel
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future):
+        """
+        Drops the Event cancelling a board once it is done.
+        """
+        self._cancels.pop(future, None)
+
+    def reshuffle(self, words):
+        """
+        Returns a Future of a (words, WordSearch) tuple for a new board with the
+        given words, using a prefetched board if there is one.
+        """
+        if words == self._words and self._boards:
+            return self._boards.popleft()
+        return self.submit(words)
+
+    def new_words(self):
+        """
+        Returns a Future of a (words, WordSearch) tuple for a board with a new
+        list of random words, using a prefetched board if there is one.
+        """
+        if self._new_words:
+            return self._new_words.popleft()
+        return self.submit(self._choose_words())
+
+    def prefetch(self, words, template=None):
+        """
+        Tops up the boards built ahead of time for the given words and for new
+        word lists. Boards prefetched for other words are dropped.
+
+        Parameters
+            words: The words currently shown
+            template: The WordSearch currently shown, reused to build the boards
+                      for the same words (see submit). Default is None.
+        """
+        if words != self._words:
+            self._cancel_all(self._boards)
+            self._words = list(words)
+
+        while len(self._boards) < self._depth:
+            self._boards.append(self.submit(self._words, template=template))
+        while self._choose_words is not None and len(self._new_words) < self._depth:
+            self._new_words.append(self.submit(self._choose_words()))
+
+    def cancel(self, future):
+        """
+        Cancels a board that was requested. A board that is already being
+        built is stopped, so the boards requested after it start right away.
+        """
+        cancel = self._cancels.pop(future, None)
+        if cancel is not None:
+            cancel.set()
+        future.cancel()
+
+    def shutdown(self):
+        """
+        Cancels every prefetched board, stopping the one being built (if any),
+        and stops the worker thread.
+        """
+        self._cancel_all(self._boards)
+        self._cancel_all(self._new_words)
+        self._executor.shutdown(wait=False)
+
+    def _cancel_all(self, futures):
+        """
+        Cancels and removes every Future in a deque.
+        """
+        while futures:
+            self.cancel(futures.pop())
@@ -0,0 +1,515 @@
+"""
+Serves Word Search generation over a small local HTTP service built on asyncio,
+listening on a TCP port or a Unix socket. Boards are generated in a bounded pool
+of worker processes, and identical requests that arrive while a board is being
+generated share that one generation.
+
+POST /generate   {"size": 16, "words": ["Mercury", "Venus"], "seed": 7,
+                  "options": {"directions": "hard"}}
+                 -> {"size": 16, "seed": 7, "board": [[...], ...],
+                     "solutions": {"MERCURY": [["M", x, y], ...], ...},
+                     "elapsed": 0.01}
+GET /metrics     -> request counts, in-flight and queued generations and
+                    latency percentiles
+
+python console.py serve --port 8765
+
+client = ServiceClient(port=8765)
+status, puzzle = await client.generate(16, ["Mercury", "Venus"], seed=7)
+
+Alex Eidt
+"""
+
+import asyncio
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from random import Random
+from time import perf_counter
+from Benchmark import percentile
+from PuzzleCache import cache_key
+from WordSearch import WordSearch
+
+
+DEFAULT_PORT = 8765
+
+# WordSearch options a request may set
+OPTIONS = (
+    "backend",
+    "order",
+    "placement",
+    "density",
+    "filler",
+    "blocklist",
+    "directions",
+)
+
+# Largest board size a request may ask for by default
+MAX_SIZE = 256
+
+# Number of recent latencies kept for the metrics
+LATENCY_WINDOW = 1024
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1 << 20
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class ServiceError(Exception):
+    """
+    An error returned to the client with the given HTTP status.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _check_option(name, value):
+    """
+    Checks the type of a WordSearch option of a request. Whether the value is
+    one WordSearch accepts is checked by WordSearch itself.
+
+    Raises
+        ServiceError: If the option has the wrong type.
+    """
+    if name == "density":
+        valid = value is None or (
+            isinstance(value, (int, float)) and not isinstance(value, bool)
+        )
+        expected = "a number or null"
+    elif name == "blocklist":
+        valid = isinstance(value, list) and all(isinstance(word, str) for word in value)
+        expected = "a list of strings"
+    elif name == "directions":
+        valid = isinstance(value, str) or (
+            isinstance(value, list)
+            and all(isinstance(direction, str) for direction in value)
+        )
+        expected = "a string or a list of strings"
+    else:
+        valid = isinstance(value, str)
+        expected = "a string"
+    if not valid:
+        raise ServiceError(400, f"options.{name} must be {expected}.")
+
+
+def _generate(size, words, seed, timeout, options):
+    """
+    Generates a board in a worker process.
+
+    Returns
+        The board and its solutions as a JSON serializable dictionary. Each
+        word maps to the [letter, x, y] coordinates of its letters in order.
+    """
+    start = perf_counter()
+    word_search = WordSearch(size, words, timeout=timeout, seed=seed, **options)
+    return {
+        "size": size,
+        "seed": seed,
+        "board": word_search.board,
+        "solutions": {
+            word: [[letter, x + i * dx, y + i * dy] for i, letter in enumerate(word)]
+            for word, (x, y, dx, dy, _) in word_search.solutions.placements()
+        },
+        "elapsed": perf_counter() - start,
+    }
+
+
+def _summary(latencies):
+    """
+    Returns the count, mean and percentiles of a list of latencies in
+    milliseconds.
+    """
+    values = [latency * 1000 for latency in latencies]
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values, default=None),
+    }
+
+
+class PuzzleService:
+    """
+    The PuzzleService generates boards for JSON requests in a process pool,
+    merging identical requests that are in flight at the same time.
+    """
+
+    def __init__(
+        self,
+        max_workers=None,
+        max_pending=64,
+        timeout=None,
+        max_size=MAX_SIZE,
+        **options,
+    ):
+        """
+        Initializes a PuzzleService.
+
+        Parameters
+            max_workers: Number of worker processes. Default is None (one per CPU).
+            max_pending: Maximum number of generations in flight (running or
+                         waiting for a worker). Further requests are rejected
+                         with 503 until one finishes. Default is 64.
+            timeout: Maximum number of seconds spent on each board. Default is
+                     None (no limit).
+            max_size: Largest board size a request may ask for. Default is
+                      MAX_SIZE.
+            options: Default WordSearch options for every request. Requests may
+                     override the ones listed in OPTIONS.
+        """
+        self._workers = max_workers or os.cpu_count() or 1
+        # Workers are spawned rather than forked so that they do not inherit
+        # the event loop or the sockets of open connections
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers, mp_context=get_context("spawn")
+        )
+        self._max_pending = max_pending
+        self._timeout = timeout
+        self._max_size = max_size
+        self._options = options
+        self._random = Random()
+        # Maps the cache_key of each generation in flight to its Future
+        self._in_flight = {}
+        self.requests = 0
+        self.generated = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._generation_times = deque(maxlen=LATENCY_WINDOW)
+
+    def _parse(self, request):
+        """
+        Validates a generation request.
+
+        Returns
+            A tuple of the size, words, seed and WordSearch options.
+
+        Raises
+            ServiceError: If the request is malformed.
+        """
+        if not isinstance(request, dict):
+            raise ServiceError(400, "The request must be a JSON object.")
+        size = request.get("size")
+        words = request.get("words")
+        seed = request.get("seed")
+        options = request.get("options", {})
+        if (
+            not isinstance(size, int)
+            or isinstance(size, bool)
+            or not 4 <= size <= self._max_size
+        ):
+            raise ServiceError(
+                400, f"size must be an integer from 4 to {self._max_size}."
+            )
+        if (
+            not isinstance(words, list)
+            or not words
+            or not all(isinstance(word, str) and word for word in words)
+        ):
+            raise ServiceError(400, "words must be a non-empty list of strings.")
+        if seed is not None and (
+            not isinstance(seed, (int, str)) or isinstance(seed, bool)
+        ):
+            raise ServiceError(400, "seed must be an integer or a string.")
+        if not isinstance(options, dict) or not set(options) <= set(OPTIONS):
+            raise ServiceError(400, f"options may only set {', '.join(OPTIONS)}.")
+        for name, value in options.items():
+            _check_option(name, value)
+
+        if seed is None:
+            seed = self._random.getrandbits(32)
+        return size, words, seed, {**self._options, **options}
+
+    async def generate(self, request):
+        """
+        Generates the board for a request, sharing the generation with any
+        identical request in flight.
+
+        Parameters
+            request: Dictionary with the size, words, and optionally the seed and
+                     options of the board. Without a seed, a random one is used
+                     and returned with the board.
+
+        Returns
+            The board and its solutions, see _generate.
+
+        Raises
+            ServiceError: If the request is malformed, the service is busy or the
+                          board cannot be generated.
+        """
+        start = perf_counter()
+        self.requests += 1
+        size, words, seed, options = self._parse(request)
+        try:
+            key = cache_key(size, words, seed, options)
+        except TypeError:
+            raise ServiceError(400, "options must be JSON values.")
+
+        future = self._in_flight.get(key)
+        if future is None:
+            if len(self._in_flight) >= self._max_pending:
+                self.rejected += 1
+                raise ServiceError(503, "Too many boards are being generated.")
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, _generate, size, words, seed, self._timeout, options
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.coalesced += 1
+
+        try:
+            # Shielded so that a client going away does not cancel the generation
+            # for the other requests sharing it
+            result = await asyncio.shield(future)
+        except TimeoutError as e:
+            raise ServiceError(504, str(e))
+        except (AssertionError, ValueError) as e:
+            raise ServiceError(422, str(e))
+        except Exception as e:
+            raise ServiceError(500, f"Generating the board failed: {e!r}")
+        finally:
+            self._latencies.append(perf_counter() - start)
+
+        return result
+
+    def _finished(self, key, future):
+        """
+        Records a finished generation and removes it from the ones in flight.
+        """
+        del self._in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+        else:
+            self.generated += 1
+            self._generation_times.append(future.result()["elapsed"])
+
+    def metrics(self):
+        """
+        Returns the request counts, the number of generations in flight and
+        waiting for a worker, and the latencies of recent requests and
+        generations in milliseconds.
+        """
+        in_flight = len(self._in_flight)
+        return {
+            "requests": self.requests,
+            "generated": self.generated,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "workers": self._workers,
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self._workers),
+            "latency_ms": _summary(self._latencies),
+            "generation_ms": _summary(self._generation_times),
+        }
+
+    async def _route(self, method, path, body):
+        """
+        Handles a parsed HTTP request.
+
+        Returns
+            A tuple of the HTTP status and the JSON response.
+        """
+        if path == "/metrics":
+            if method != "GET":
+                raise ServiceError(405, "Use GET for /metrics.")
+            return 200, self.metrics()
+        if path == "/generate":
+            if method != "POST":
+                raise ServiceError(405, "Use POST for /generate.")
+            try:
+                request = json.loads(body)
+            except ValueError:
+                raise ServiceError(400, "The request body must be JSON.")
+            return 200, await self.generate(request)
+        raise ServiceError(404, f"Unknown path {path}.")
+
+    async def handle(self, reader, writer):
+        """
+        Serves one HTTP request on a connection and closes it.
+        """
+        try:
+            request_line = await reader.readline()
+            method, path, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                raise ServiceError(413, "The request body is too large.")
+            body = await reader.readexactly(length) if length else b""
+            status, response = await self._route(method, path, body)
+        except ServiceError as e:
+            status, response = e.status, {"error": e.message}
+        except (ValueError, asyncio.IncompleteReadError):
+            status, response = 400, {"error": "Malformed HTTP request."}
+        except Exception as e:
+            status, response = 500, {"error": repr(e)}
+
+        data = json.dumps(response).encode()
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + data
+        )
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Starts listening for requests.
+
+        Parameters
+            host, port: Address to listen on. Default is 127.0.0.1:DEFAULT_PORT.
+                        A port of 0 picks a free port.
+            path: Path of a Unix socket to listen on instead. Default is None.
+
+        Returns
+            The asyncio Server.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        """
+        Stops the worker processes. Generations that have not started yet are
+        cancelled.
+        """
+        for future in self._in_flight.values():
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+
+class ServiceClient:
+    """
+    The ServiceClient sends requests to a PuzzleService, opening one connection
+    per request.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, path=None):
+        """
+        Initializes a ServiceClient.
+
+        Parameters
+            host, port: Address of the service. Default is 127.0.0.1:DEFAULT_PORT.
+            path: Path of the Unix socket of the service, used instead of host
+                  and port. Default is None.
+        """
+        self.host = host
+        self.port = port
+        self.path = path
+
+    async def request(self, method, path, payload=None):
+        """
+        Sends a request to the service.
+
+        Parameters
+            method: HTTP method
+            path: Path of the endpoint
+            payload: Object sent as the JSON body. Default is None (no body).
+
+        Returns
+            A tuple of the HTTP status and the decoded JSON response.
+        """
+        if self.path is not None:
+            reader, writer = await asyncio.open_unix_connection(self.path)
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        body = b"" if payload is None else json.dumps(payload).encode()
+        writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+
+        status = int((await reader.readline()).split(b" ", 2)[1])
+        length = None
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        data = await (reader.read() if length is None else reader.readexactly(length))
+        writer.close()
+
+        return status, json.loads(data)
+
+    async def generate(self, size, words, seed=None, **options):
+        """
+        Asks the service for a board.
+
+        Returns
+            A tuple of the HTTP status and the board and its solutions (or the
+            error) as a dictionary.
+        """
+        payload = {"size": size, "words": list(words), "seed": seed}
+        if options:
+            payload["options"] = options
+        return await self.request("POST", "/generate", payload)
+
+    async def metrics(self):
+        """
+        Asks the service for its metrics.
+
+        Returns
+            A tuple of the HTTP status and the metrics as a dictionary.
+        """
+        return await self.request("GET", "/metrics")
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, path=None, **kwargs):
+    """
+    Runs a PuzzleService until cancelled.
+
+    Parameters
+        host, port, path: Address to listen on, see PuzzleService.start
+        kwargs: Keyword arguments passed on to PuzzleService
+    """
+    service = PuzzleService(**kwargs)
+    server = await service.start(host, port, path)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,258 @@
+"""
+Stores the solutions of a WordSearch board compactly. Each word is recorded as
+its placement (start_x, start_y, dx, dy, length) under a small integer id. The
+board keeps one 32-bit id per cell in a flat array, and the few cells shared by
+more than one word keep the ids of the other words in an overflow map, so the
+memory used does not grow with the number of words and asking whether a cell
+is part of a solution or which words cover it takes constant time.
+
+Solutions is also a read-only mapping of each word to the set of (letter, x, y)
+coordinates of its letters, which is how WordSearch.solutions has always been
+used:
+
+for word, coords in word_search.solutions.items():
+    for letter, x, y in coords:
+        ...
+
+Alex Eidt
+"""
+
+from array import array
+from collections.abc import Mapping
+from Grid import BitboardPlacements, count_bits, start_mask
+
+
+class Solutions(Mapping):
+    """
+    The Solutions class maps the words hidden in a board to the coordinates of
+    their letters, backed by one placement per word and one word id per cell.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes an empty Solutions store.
+
+        Parameters
+            size: Length of one side of the board
+        """
+        self._size = size
+        # Maps each word to its (start_x, start_y, dx, dy, length) placement
+        self._placements = {}
+        # Maps each word to its id and back
+        self._ids = {}
+        self._words = []
+        self._free_ids = []
+        # One more than the id of a word passing through each cell (index
+        # y * size + x), or 0 for cells not covered by any word
+        self._cells = array("i", [0]) * (size * size)
+        # Maps the index of each cell covered by more than one word to the list
+        # of the ids of the words besides the one in self._cells
+        self._overflow = {}
+        self._covered = 0
+
+    def add(self, word, x, y, dx, dy):
+        """
+        Records a word placed on the board.
+
+        Parameters
+            word: The word that was placed
+            x, y: Starting coordinates of the word
+            dx, dy: Step size in the x and y direction
+        """
+        if self._free_ids:
+            word_id = self._free_ids.pop()
+            self._words[word_id] = word
+        else:
+            word_id = len(self._words)
+            self._words.append(word)
+        self._ids[word] = word_id
+        self._placements[word] = (x, y, dx, dy, len(word))
+
+        cells = self._cells
+        step = dy * self._size + dx
+        index = y * self._size + x
+        for _ in word:
+            if cells[index]:
+                self._overflow.setdefault(index, []).append(word_id)
+            else:
+                cells[index] = word_id + 1
+                self._covered += 1
+            index += step
+
+    def remove(self, word):
+        """
+        Removes a word from the solutions.
+
+        Parameters
+            word: The word to remove
+
+        Returns
+            A list of the (x, y) coordinates that are no longer covered by any word.
+        """
+        x, y, dx, dy, length = self._placements.pop(word)
+        word_id = self._ids.pop(word)
+        self._words[word_id] = None
+        self._free_ids.append(word_id)
+
+        cells = self._cells
+        uncovered = []
+        for i in range(length):
+            index = (y + i * dy) * self._size + x + i * dx
+            others = self._overflow.get(index)
+            if cells[index] == word_id + 1:
+                if others:
+                    cells[index] = others.pop() + 1
+                else:
+                    cells[index] = 0
+                    self._covered -= 1
+                    uncovered.append((x + i * dx, y + i * dy))
+            else:
+                others.remove(word_id)
+            if others is not None and not others:
+                del self._overflow[index]
+
+        return uncovered
+
+    def placement(self, word):
+        """
+        Returns the (start_x, start_y, dx, dy, length) placement of a word.
+        """
+        return self._placements[word]
+
+    def placements(self):
+        """
+        Returns a view of (word, (start_x, start_y, dx, dy, length)) pairs.
+        """
+        return self._placements.items()
+
+    def covered(self, x, y):
+        """
+        Returns True if the cell (x, y) is part of any hidden word.
+        """
+        return self._cells[y * self._size + x] != 0
+
+    def words_at(self, x, y):
+        """
+        Returns a list of the words passing through the cell (x, y).
+        """
+        index = y * self._size + x
+        if not self._cells[index]:
+            return []
+        ids = [self._cells[index] - 1]
+        ids.extend(self._overflow.get(index, ()))
+        return [self._words[word_id] for word_id in sorted(ids)]
+
+    def fewest_blocking(self, word, orientations):
+        """
+        Finds the placements of a word that are blocked by the fewest words,
+        where a word blocks a placement if it covers one of its cells with a
+        different letter. For each orientation, the starting cells blocked by
+        each word are gathered into one bitboard from the letters of that word
+        and added to a bit-sliced counter, so the time taken grows with the
+        number of words rather than with the number of starting cells.
+
+        Parameters
+            word: The word that the placements are being found for
+            orientations: List of (ox, oy, xs, ys) tuples as returned by
+                          WordSearch._get_orientations
+
+        Returns
+            A tuple of the number of words blocking those placements and a
+            BitboardPlacements sequence of their (x, y, ox, oy) tuples, in the
+            order of the orientations and then of the starting cells.
+        """
+        size = self._size
+        best = []
+        fewest = None
+        for ox, oy, xs, ys in orientations:
+            if not xs or not ys:
+                continue
+            step = oy * size + ox
+            # reach[letter] has bit top - i * step set for every letter i of
+            # the word other than letter, the starts a cell holding letter
+            # blocks relative to that cell
+            top = max(0, (len(word) - 1) * step)
+            reach = {}
+            starts = start_mask(size, xs, ys)
+            # counts[k] holds bit k of the number of words blocking each start
+            counts = []
+            for placed, (x, y, dx, dy, length) in self._placements.items():
+                first = y * size + x
+                placed_step = dy * size + dx
+                low = min(first, first + (length - 1) * placed_step)
+                # Bit b of blocked is the start low - top + b
+                blocked = 0
+                index = first - low
+                for letter in placed:
+                    bits = reach.get(letter)
+                    if bits is None:
+                        bits = 0
+                        for i, other in enumerate(word):
+                            if other != letter:
+                                bits |= 1 << (top - i * step)
+                        reach[letter] = bits
+                    blocked |= bits << index
+                    index += placed_step
+                if low >= top:
+                    blocked <<= low - top
+                else:
+                    blocked >>= top - low
+                count_bits(counts, blocked & starts)
+
+            # The starts with the lowest count, from the top bit of the
+            # counter down
+            blocking = 0
+            for k in reversed(range(len(counts))):
+                fewer = starts & ~counts[k]
+                if fewer:
+                    starts = fewer
+                else:
+                    blocking |= 1 << k
+            if fewest is None or blocking < fewest:
+                fewest = blocking
+                best = []
+            if blocking == fewest:
+                best.append((ox, oy, starts))
+
+        return fewest, BitboardPlacements(size, best)
+
+    def covered_count(self):
+        """
+        Returns the number of cells covered by at least one word.
+        """
+        return self._covered
+
+    def as_dict(self):
+        """
+        Returns the solutions as a dictionary mapping each word to a set of
+        (letter, x, y) coordinates.
+        """
+        return {word: self[word] for word in self._placements}
+
+    def __getitem__(self, word):
+        """
+        Returns the set of (letter, x, y) coordinates of the letters of a word.
+        """
+        x, y, dx, dy, _ = self._placements[word]
+        return {(letter, x + i * dx, y + i * dy) for i, letter in enumerate(word)}
+
+    def __iter__(self):
+        """
+        Iterates over the words in the order they were added.
+        """
+        return iter(self._placements)
+
+    def __len__(self):
+        """
+        Returns the number of words.
+        """
+        return len(self._placements)
+
+    def __contains__(self, word):
+        """
+        Returns True if the word is hidden in the board.
+        """
+        return word in self._placements
+
+    def __repr__(self):
+        return f"Solutions({self.as_dict()!r})"
@@ -0,0 +1,310 @@
+"""
+Generates very large Word Search boards (such as 1000x1000 posters with
+thousands of words) by splitting the board into tiles that are worked on in
+parallel worker processes:
+
+1. The words are shared out among the tiles, balancing the number of letters
+   per cell, and each tile places its words on its own small board.
+2. Words too long for a tile, or that a tile could not fit, are placed on the
+   whole board in a final reconciliation pass, where they may cross tile
+   boundaries and evict other words like in WordSearch.
+3. Every tile fills its empty cells in parallel. With the "safe" filler the
+   tiles are filled in four phases of a checkerboard pattern, so no two tiles
+   filled at the same time are within reach of each other's words, and each
+   tile sees the letters already filled in around it.
+
+A TiledWordSearch is a WordSearch, so its board and solutions are used the same
+way and it can be exported, solved and displayed like any other board:
+
+word_search = TiledWordSearch(1000, words, tile_size=250, seed=7)
+
+The board only depends on the seed and the options, not on the number of
+worker processes.
+
+Alex Eidt
+"""
+
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from random import Random
+from time import perf_counter
+from Grid import LETTERS
+from WordSearch import WordSearch, safe_fill
+
+
+# Default length of one side of a tile
+TILE_SIZE = 256
+
+# Largest number of word letters per cell given to a tile. The words beyond it
+# are placed in the reconciliation pass.
+TILE_DENSITY = 0.5
+
+# Options of TiledWordSearch passed on to the WordSearch of each tile
+TILE_OPTIONS = ("backend", "order", "placement", "density", "directions")
+
+
+class _Tile(WordSearch):
+    """
+    The WordSearch of a single tile, which only places its words and leaves the
+    empty cells empty.
+    """
+
+    def _fill_board(self):
+        """
+        Leaves the empty cells empty, they are filled once the whole board is
+        put together.
+        """
+
+
+def _place_tile(size, words, seed, options, timeout):
+    """
+    Places words on a tile in a worker process. If they do not all fit, the
+    shortest ones are given back for the reconciliation pass, a tenth at a time.
+
+    Parameters
+        size: Length of one side of the tile
+        words: List of words, longest first
+        seed: Seed of the tile
+        options: Keyword arguments passed on to WordSearch
+        timeout: Maximum number of seconds to spend placing words, or None
+
+    Returns
+        A tuple of the tile as a list of lists of letters (None for empty
+        cells, or None if no word was placed), the list of (word, x, y, dx, dy)
+        placements on the tile and the list of words that were not placed.
+
+    Raises
+        TimeoutError: If placing the words takes longer than timeout seconds.
+    """
+    rng = Random(seed)
+    words = list(words)
+    dropped = []
+    while words:
+        try:
+            tile = _Tile(
+                size, words, seed=rng.getrandbits(32), timeout=timeout, **options
+            )
+        except ValueError:
+            cut = max(1, len(words) // 10)
+            dropped.extend(words[-cut:])
+            del words[-cut:]
+            continue
+        placements = [
+            (word, *placement[:4]) for word, placement in tile.solutions.placements()
+        ]
+        return tile.board, placements, dropped
+
+    return None, [], dropped
+
+
+def _fill_tile(rows, box, seed, words):
+    """
+    Fills the empty cells of a tile in a worker process.
+
+    Parameters
+        rows: The tile and the cells around it within reach of the longest word,
+              as a list of lists of letters
+        box: (x0, y0, x1, y1) bounds of the tile within rows
+        seed: Seed of the tile
+        words: Sorted tuple of the words the "safe" filler avoids, or None to
+               pick each letter uniformly at random
+
+    Returns
+        The filled tile as a list of lists of letters.
+    """
+    rng = Random(seed)
+    x0, y0, x1, y1 = box
+    if words is None:
+        # All of the letters are picked at once, which is much faster than one
+        # call per cell
+        empty = [(row, x) for row in rows[y0:y1] for x in range(x0, x1) if not row[x]]
+        for (row, x), letter in zip(empty, rng.choices(LETTERS, k=len(empty))):
+            row[x] = letter
+    else:
+        safe_fill(rows, rng, words, range(x0, x1), range(y0, y1))
+
+    return [row[x0:x1] for row in rows[y0:y1]]
+
+
+class TiledWordSearch(WordSearch):
+    """
+    The TiledWordSearch class builds a WordSearch board tile by tile in worker
+    processes, for boards too large to generate in a single process.
+    """
+
+    def __init__(
+        self,
+        size,
+        words,
+        tile_size=TILE_SIZE,
+        max_workers=None,
+        backend="bitboard",
+        **options,
+    ):
+        """
+        Initializes a TiledWordSearch.
+
+        Parameters
+            size: Size of the board. Board will always be a square of size x size letters
+            words: List of words to be hidden in the word search
+            tile_size: Largest length of one side of a tile. The board is split
+                       into the fewest tiles per side that are at most this long,
+                       all of (nearly) the same size. Default is TILE_SIZE.
+            max_workers: Number of worker processes. Default is None (one per
+                         CPU). With max_workers=1 the tiles are generated in
+                         this process.
+            backend: Board backend, see WordSearch. Default is "bitboard", which
+                     finds the placements of the reconciliation pass fastest
+                     on large boards.
+            options: Keyword arguments passed on to WordSearch. The timeout
+                     applies to the whole board.
+
+        Raises
+            ValueError: If the words cannot all be placed on a board of the given size.
+            TimeoutError: If placing the words takes longer than timeout seconds.
+        """
+        self._tile_count = count = ceil(size / tile_size)
+        bounds = [i * size // count for i in range(count + 1)]
+        # (x0, y0, x1, y1) bounds of each tile, row by row
+        self._tiles = [
+            (bounds[i], bounds[j], bounds[i + 1], bounds[j + 1])
+            for j in range(count)
+            for i in range(count)
+        ]
+        self._tile_size = tile_size
+        self._max_workers = max_workers
+        self._tile_options = {
+            name: options[name] for name in TILE_OPTIONS if name in options
+        }
+        self._tile_options["backend"] = backend
+        super().__init__(size, words, backend=backend, **options)
+
+    def _generate(self, start):
+        """
+        Generates the board, see WordSearch._generate. The tile size is part of
+        the cache key, since it changes the board.
+        """
+        self._cache_options["tile_size"] = self._tile_size
+        super()._generate(start)
+
+    def _map(self, function, tasks):
+        """
+        Runs a function on the arguments of each task, in worker processes if
+        there is more than one task.
+
+        Returns
+            The list of results, in the order of tasks.
+        """
+        if self._max_workers == 1 or len(tasks) < 2:
+            return [function(*task) for task in tasks]
+
+        with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+            return list(executor.map(function, *zip(*tasks)))
+
+    def _assign(self):
+        """
+        Shares the words out among the tiles, longest first, always giving the
+        next word to the tile with the fewest letters per cell.
+
+        Returns
+            A tuple of the list of words of each tile and the set of words left
+            for the reconciliation pass.
+        """
+        assigned = [[] for _ in self._tiles]
+        leftovers = set()
+        # (letters per cell, tile index, letters, number of cells)
+        heap = [
+            (0.0, i, 0, (x1 - x0) * (y1 - y0))
+            for i, (x0, y0, x1, y1) in enumerate(self._tiles)
+        ]
+        for word in sorted(self._words, key=len, reverse=True):
+            _, i, letters, cells = heap[0]
+            x0, y0, x1, y1 = self._tiles[i]
+            letters += len(word)
+            if min(x1 - x0, y1 - y0) - len(word) <= 2 or letters > TILE_DENSITY * cells:
+                leftovers.add(word)
+                continue
+            assigned[i].append(word)
+            heapq.heapreplace(heap, (letters / cells, i, letters, cells))
+
+        return assigned, leftovers
+
+    def _fill_with_words(self, words=None):
+        """
+        Places the words on the tiles in worker processes, then places the words
+        left over on the whole board.
+
+        Returns
+            False if the words left over could not all be added to the board
+            within the eviction budget, True otherwise.
+        """
+        assigned, leftovers = self._assign()
+        seeds = [self._random.getrandbits(32) for _ in self._tiles]
+        timeout = (
+            None if self._deadline is None else max(0, self._deadline - perf_counter())
+        )
+        tasks = [
+            (min(x1 - x0, y1 - y0), tile_words, seed, self._tile_options, timeout)
+            for (x0, y0, x1, y1), tile_words, seed in zip(self._tiles, assigned, seeds)
+        ]
+        results = self._map(_place_tile, tasks)
+
+        # Each tile is written onto the board at once rather than word by word
+        for (x0, y0, _, _), (rows, placements, dropped) in zip(self._tiles, results):
+            if rows is not None:
+                self._grid.paste(x0, y0, rows)
+            for word, x, y, dx, dy in placements:
+                self.solutions.add(word, x0 + x, y0 + y, dx, dy)
+                self._letters += len(word)
+                if self.stats is not None:
+                    self.stats.on_place(word, x0 + x, y0 + y, dx, dy)
+            leftovers.update(dropped)
+
+        # Reconciliation pass, in the order the words would have been placed in
+        return super()._fill_with_words(
+            [word for word in self._words if word in leftovers]
+        )
+
+    def _fill_board(self):
+        """
+        Fills all empty locations of the board with random letters, tile by tile
+        in worker processes.
+        """
+        seeds = [self._random.getrandbits(32) for _ in self._tiles]
+        tiles = list(zip(self._tiles, seeds))
+        if self._filler != "safe":
+            words = None
+            reach = 0
+            phases = [tiles]
+        else:
+            words = self._scanner_words()
+            reach = max(map(len, words)) - 1
+            smallest = min(min(x1 - x0, y1 - y0) for x0, y0, x1, y1 in self._tiles)
+            if reach < smallest:
+                # Tiles of one phase are a whole tile apart from each other
+                count = self._tile_count
+                phases = [
+                    [
+                        tile
+                        for i, tile in enumerate(tiles)
+                        if (i % count % 2, i // count % 2) == phase
+                    ]
+                    for phase in ((0, 0), (1, 0), (0, 1), (1, 1))
+                ]
+            else:
+                phases = [[tile] for tile in tiles]
+
+        for phase in phases:
+            board = self._grid.rows()
+            tasks = []
+            for (x0, y0, x1, y1), seed in phase:
+                left, top = max(0, x0 - reach), max(0, y0 - reach)
+                right = min(self._size, x1 + reach)
+                bottom = min(self._size, y1 + reach)
+                rows = [row[left:right] for row in board[top:bottom]]
+                box = (x0 - left, y0 - top, x1 - left, y1 - top)
+                tasks.append((rows, box, seed, words))
+
+            for ((x0, y0, _, _), _), filled in zip(phase, self._map(_fill_tile, tasks)):
+                self._grid.paste(x0, y0, filled)
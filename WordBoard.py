@@ -7,9 +7,146 @@ Alex Eidt
 import tkinter as tk
 import tkinter.font as tkFont
 from os import listdir, getcwd
-from random import choice
+from random import Random
 from functools import partial
-from WordSearch import WordSearch
+from concurrent.futures import CancelledError
+from Exporter import export
+from WordDictionary import WordDictionary
+from PuzzleQueue import PuzzleQueue
+from PuzzleCache import PuzzleCache
+
+
+DEFAULT_BG = "SystemButtonFace"
+
+# Milliseconds between checks for a board being generated in the background
+POLL_MS = 50
+
+# Color of the letters of disabled cells on the canvas
+DISABLED_FG = "gray50"
+
+
+class ButtonRenderer:
+    """
+    Draws the board as one tk.Button per cell.
+    """
+
+    def __init__(self, parent, size, pressed):
+        """
+        Creates a size x size grid of buttons.
+
+        Parameters
+            parent: Widget the buttons are placed in
+            size: Length of one side of the board
+            pressed: Function called with the (row, col) of a pressed button
+        """
+        self._buttons = []
+        for i in range(size):
+            row = []
+            for j in range(size):
+                row.append(tk.Button(parent, padx=5, command=partial(pressed, i, j)))
+                row[-1].grid(row=i, column=j, sticky="ew")
+            self._buttons.append(row)
+
+    def configure(self, row, col, **changes):
+        """
+        Sets the text, bg and/or state of the cell at (row, col).
+        """
+        self._buttons[row][col].configure(**changes)
+
+
+class CanvasRenderer:
+    """
+    Draws the board on a single tk.Canvas: one text item per cell, grid lines
+    and a highlight rectangle for each cell whose background is not DEFAULT_BG.
+    Highlight rectangles are only created the first time a cell is highlighted
+    and hidden afterwards, so large boards start up with one item per cell.
+    Clicks are handled by one binding that maps pixel positions to cells.
+    """
+
+    def __init__(self, parent, size, pressed):
+        """
+        Creates the canvas and its items.
+
+        Parameters
+            parent: Widget the canvas is placed in
+            size: Length of one side of the board
+            pressed: Function called with the (row, col) of a pressed cell
+        """
+        font = tkFont.nametofont("TkDefaultFont")
+        self._cell = font.metrics("linespace") + 10
+        self._size = size
+        self._pressed = pressed
+        extent = size * self._cell
+
+        self._canvas = tk.Canvas(
+            parent, width=extent, height=extent, bg=DEFAULT_BG, highlightthickness=0
+        )
+        self._canvas.pack()
+        for i in range(size + 1):
+            position = i * self._cell
+            self._canvas.create_line(position, 0, position, extent, fill="gray")
+            self._canvas.create_line(0, position, extent, position, fill="gray")
+
+        half = self._cell // 2
+        # Item IDs of the letters and highlights, indexed by row * size + col
+        self._texts = [
+            self._canvas.create_text(
+                col * self._cell + half, row * self._cell + half, text="", font=font
+            )
+            for row in range(size)
+            for col in range(size)
+        ]
+        self._highlights = [None] * (size * size)
+        self._disabled = [False] * (size * size)
+        self._canvas.bind("<Button-1>", self._click)
+
+    def _click(self, event):
+        """
+        Calls pressed with the cell under the mouse unless it is disabled.
+        """
+        row = event.y // self._cell
+        col = event.x // self._cell
+        if 0 <= row < self._size and 0 <= col < self._size:
+            if not self._disabled[row * self._size + col]:
+                self._pressed(row, col)
+
+    def configure(self, row, col, text=None, bg=None, state=None):
+        """
+        Sets the text, bg and/or state of the cell at (row, col).
+        """
+        index = row * self._size + col
+        if text is not None:
+            self._canvas.itemconfigure(self._texts[index], text=text)
+        if state is not None:
+            self._disabled[index] = state == tk.DISABLED
+            self._canvas.itemconfigure(
+                self._texts[index],
+                fill=DISABLED_FG if self._disabled[index] else "black",
+            )
+        if bg is not None:
+            highlight = self._highlights[index]
+            if bg == DEFAULT_BG:
+                if highlight is not None:
+                    self._canvas.itemconfigure(highlight, state=tk.HIDDEN)
+            elif highlight is None:
+                x = col * self._cell
+                y = row * self._cell
+                highlight = self._canvas.create_rectangle(
+                    x + 1,
+                    y + 1,
+                    x + self._cell - 1,
+                    y + self._cell - 1,
+                    fill=bg,
+                    width=0,
+                )
+                self._canvas.tag_lower(highlight, self._texts[index])
+                self._highlights[index] = highlight
+            else:
+                self._canvas.itemconfigure(highlight, fill=bg, state=tk.NORMAL)
+
+
+# Ways of drawing the board. See WordBoard.__init__.
+RENDERERS = {"buttons": ButtonRenderer, "canvas": CanvasRenderer}
 
 
 class WordBoard:
@@ -23,7 +160,16 @@ class WordBoard:
     LaTeX and String form. This file also contains the solution.
     """
 
-    def __init__(self, size=16, color="yellow", file_name="words.txt", words=None):
+    def __init__(
+        self,
+        size=16,
+        color="yellow",
+        file_name="words.txt",
+        words=None,
+        seed=None,
+        cache=None,
+        renderer="buttons",
+    ):
         """
         Initializes a WordBoard GUI.
 
@@ -41,12 +187,27 @@ class WordBoard:
             words: A list of words entered by the user. Allows for customized word searches
                    with custom words. Default is None. If words is None, then words will be
                    randomly chosen from words.txt or the file given by file_name.
+            seed: Seed for the random number generator, or a random.Random instance
+                  to draw from. Every word list and board shown (including after
+                  "New Words" and "Reshuffle") is reproducible from the seed.
+                  Default is None (unseeded).
+            cache: A PuzzleCache, or the path of its directory, that boards are
+                   read from and stored in, so that boards shown before are not
+                   generated again. Default is None.
+            renderer: How the board is drawn. "buttons" uses one button per cell.
+                      "canvas" draws every cell on a single canvas, which starts
+                      up much faster and uses less memory on large boards.
+                      Default is "buttons".
         """
         assert size > 3, "Size must be greater than 3"
+        if renderer not in RENDERERS:
+            raise ValueError(f"Unknown renderer {renderer!r}.")
 
         root = tk.Tk()
         root.title("Word Search")
         root.resizable(width=False, height=False)
+        root.protocol("WM_DELETE_WINDOW", self._close)
+        self._root = root
 
         self._word_grid = tk.Frame(root)
         self._word_list = tk.Frame(root)
@@ -55,44 +216,35 @@ class WordBoard:
         self._solution_shown = False
         self._size = size
         self._color = color
+        self._random = seed if isinstance(seed, Random) else Random(seed)
 
         # If file_name is not present in the current directory, the
         # New Words button will be disabled.
         new_words_button = tk.DISABLED
         if file_name in listdir(getcwd()):
             new_words_button = tk.NORMAL
-            with open(file_name, mode="r") as f:
-                self._wordstxt = filter(None, f.read().split("\n"))
-                self._wordstxt = list(
-                    filter(lambda x: len(x) < self._size - 3, self._wordstxt)
-                )
+            self._dictionary = WordDictionary.load(file_name)
         elif words is None:
             raise FileNotFoundError(
                 f"""{file_name} not present in the current directory. {file_name}
                                     must contain words separated by newline (\\n) characters."""
             )
 
-        # Buttons that have been pushed
+        # (col, row) coordinates of the cells that have been pushed
         self._pushed = set()
+        # Maps each word to the number of its letters that have not been pushed
+        self._remaining = {}
 
         self._words = words
         if self._words is None:
             self._choose_random_words()
         else:
-            self._words = list(set(map(str.upper, self._words)))
+            self._words = sorted(set(map(str.upper, self._words)))
 
-        # Create empty SIZExSIZE grid of buttons
-        self._buttons = []
-        for i in range(self._size):
-            row = []
-            for j in range(self._size):
-                row.append(
-                    tk.Button(
-                        self._word_grid, padx=5, command=partial(self._pressed, i, j)
-                    )
-                )
-                row[-1].grid(row=i, column=j, sticky="ew")
-            self._buttons.append(row)
+        # Create empty SIZExSIZE grid of cells. The options last given to each
+        # cell are kept in self._cells so that only changed options are sent to Tk.
+        self._renderer = RENDERERS[renderer](self._word_grid, self._size, self._pressed)
+        self._cells = [[{} for _ in range(self._size)] for _ in range(self._size)]
 
         # Menu Buttons at the top right of the GUI
         # Menu Label
@@ -100,28 +252,66 @@ class WordBoard:
             row=0, column=0, columnspan=2, sticky="ew"
         )
         # "New Words" Button
-        tk.Button(
+        self._new_words_state = new_words_button
+        self._new_words_button = tk.Button(
             self._menu,
             text="New Words",
             padx=1,
             pady=1,
             state=new_words_button,
             command=self._select_new,
-        ).grid(row=1, column=0, sticky="ew")
+        )
+        self._new_words_button.grid(row=1, column=0, sticky="ew")
         # "Export" Button
         self._export_button = tk.Button(
             self._menu, text="Export", padx=1, pady=1, command=self._export
         )
         self._export_button.grid(row=1, column=1, sticky="ew")
         # "Solution" Button
-        tk.Button(
+        self._solution_button = tk.Button(
             self._menu, text="Solution", padx=1, pady=1, command=self._solution
-        ).grid(row=2, column=0, sticky="ew")
+        )
+        self._solution_button.grid(row=2, column=0, sticky="ew")
         # "Reshuffle" Button
-        tk.Button(
+        self._reshuffle_button = tk.Button(
             self._menu, text="Reshuffle", padx=1, pady=1, command=self._reshuffle
-        ).grid(row=2, column=1, sticky="ew")
-
+        )
+        self._reshuffle_button.grid(row=2, column=1, sticky="ew")
+        # "Cancel" Button, only enabled while a board is being generated
+        self._cancel_button = tk.Button(
+            self._menu,
+            text="Cancel",
+            padx=1,
+            pady=1,
+            state=tk.DISABLED,
+            command=self._cancel,
+        )
+        self._cancel_button.grid(row=3, column=0, columnspan=2, sticky="ew")
+        # Shows whether a board is being generated
+        self._status = tk.Label(self._menu, text="", pady=5)
+        self._status.grid(row=4, column=0, columnspan=2, sticky="ew")
+
+        # Boards are generated on a background thread, with the next few boards
+        # prepared ahead of time. self._pending is the board waiting to be shown.
+        self._queue = PuzzleQueue(
+            self._size,
+            lambda: self._random.getrandbits(32),
+            choose_words=(
+                None
+                if new_words_button == tk.DISABLED
+                else lambda: self._random_words(self._random)
+            ),
+            cache=PuzzleCache(cache) if isinstance(cache, str) else cache,
+        )
+        self._pending = None
+
+        tk.Label(
+            self._word_list, text="Words", pady=5, font=tkFont.Font(weight="bold")
+        ).grid(row=2, column=0, columnspan=2)
+        # Word labels are kept as (label, options) pairs and reused for new words
+        self._word_labels = []
+        self._visible_labels = 0
+        # Maps each word to its (label, options) pair
         self._labels = {}
         self._word_search = None
         self._create_labels()
@@ -135,107 +325,275 @@ class WordBoard:
 
     def _create_labels(self):
         """
-        Creates/changes the word labels on the right side of the GUI.
+        Creates/changes the word labels on the right side of the GUI. Existing
+        labels are reused for the new words and labels that are not needed
+        anymore are hidden.
         """
-        for label in self._labels.values():
-            label.destroy()
-        self._labels.clear()
-        self._labels = {
-            "Words": tk.Label(
-                self._word_list, text="Words", pady=5, font=tkFont.Font(weight="bold")
-            )
-        }
-        self._labels["Words"].grid(row=2, column=0, columnspan=2)
+        self._labels = {}
         for i, word in enumerate(sorted(self._words)):
-            self._labels[word] = tk.Label(self._word_list, text=word, anchor="w")
-            self._labels[word].grid(
-                row=(i // 2) + (i % 1) + 3, column=i % 2, sticky="W"
-            )
+            if i == len(self._word_labels):
+                label = tk.Label(self._word_list, anchor="w")
+                label.grid(row=(i // 2) + (i % 1) + 3, column=i % 2, sticky="W")
+                self._word_labels.append((label, {}))
+            elif i >= self._visible_labels:
+                self._word_labels[i][0].grid()
+            self._labels[word] = self._word_labels[i]
+            self._set_label(word, text=word, bg=DEFAULT_BG)
+
+        for label, _ in self._word_labels[len(self._words) : self._visible_labels]:
+            label.grid_remove()
+        self._visible_labels = len(self._words)
+
+    @staticmethod
+    def _configure(configure, options, **changes):
+        """
+        Configures a widget or cell with only the options that differ from the
+        ones it was last configured with.
+
+        Parameters
+            configure: Function called with the changed options as keyword
+                       arguments, such as the configure method of a widget
+            options: Dictionary of the options last configured. Updated with
+                     the changes.
+            changes: The options to set
+        """
+        changed = {k: v for k, v in changes.items() if options.get(k) != v}
+        if changed:
+            options.update(changed)
+            configure(**changed)
+
+    def _set_cell(self, row, col, **changes):
+        """
+        Configures the cell at (row, col), skipping unchanged options.
+        """
+        self._configure(
+            partial(self._renderer.configure, row, col),
+            self._cells[row][col],
+            **changes,
+        )
 
-    def _choose_random_words(self):
+    def _set_label(self, word, **changes):
+        """
+        Configures the label of a word, skipping unchanged options.
+        """
+        label, options = self._labels[word]
+        self._configure(label.configure, options, **changes)
+
+    def _choose_random_words(self, seed=None):
         """
         Chooses a random number of words (proportional to the size of the board)
         from the file_name file.
+
+        Parameters
+            seed: Seed or random.Random instance used to choose the words.
+                  Default is None, which draws from the WordBoard's generator.
         """
-        self._words = set()
-        for _ in range(choice(range(self._size // 3, self._size))):
-            self._words.add(choice(self._wordstxt).upper())
-        self._words = list(self._words)
+        self._words = self._random_words(self._rng(seed))
+
+    def _random_words(self, rng):
+        """
+        Returns a sorted list of a random number of random words (proportional
+        to the size of the board) from the file_name file.
+
+        Parameters
+            rng: random.Random instance used to choose the words
+        """
+        max_len = self._size - 4
+        count = rng.choice(range(self._size // 3, self._size))
+        count = min(count, self._dictionary.count(max_len))
+        return sorted(self._dictionary.sample(count, max_len, rng))
+
+    def _rng(self, seed):
+        """
+        Returns the random.Random instance to use for the given seed.
+
+        Parameters
+            seed: None for the WordBoard's own generator, a random.Random
+                  instance, or a seed for a new generator.
+        """
+        if seed is None:
+            return self._random
+        return seed if isinstance(seed, Random) else Random(seed)
 
     def _pressed(self, row, col):
         """
-        The command for every button in the board. Checks to see if a word
-        has been found and disables all buttons associated with a word once
+        The command for every cell in the board. Checks to see if a word
+        has been found and disables all cells associated with a word once
         found.
 
         Parameters
-            row, col: The row and column index of the button in the self._buttons
-                      list
+            row, col: The row and column index of the cell
         """
-        if self._buttons[row][col].cget("bg") == self._color:
-            self._buttons[row][col].configure(bg="SystemButtonFace")
-            self._pushed.remove((self._buttons[row][col].cget("text"), col, row))
+        # The first board may still be being generated
+        if self._word_search is None:
+            return
+        words = self._word_search.solutions.words_at(col, row)
+        if self._cells[row][col]["bg"] == self._color:
+            self._set_cell(row, col, bg=DEFAULT_BG)
+            if (col, row) in self._pushed:
+                self._pushed.remove((col, row))
+                for word in words:
+                    self._remaining[word] += 1
         else:
-            self._buttons[row][col].configure(bg=self._color)
-            self._pushed.add((self._buttons[row][col].cget("text"), col, row))
-            for word, coords in self._word_search.solutions.items():
-                if coords & self._pushed == coords:
-                    for _, col, row in coords:
-                        self._buttons[row][col].configure(state=tk.DISABLED)
-                    self._labels[word].configure(bg=self._color)
+            self._set_cell(row, col, bg=self._color)
+            self._pushed.add((col, row))
+            for word in words:
+                self._remaining[word] -= 1
+                if not self._remaining[word]:
+                    for _, x, y in self._word_search.solutions[word]:
+                        self._set_cell(y, x, state=tk.DISABLED)
+                    self._set_label(word, bg=self._color)
+
+    def _reset_remaining(self):
+        """
+        Resets the count of letters left to find in each word. The words
+        passing through each cell are looked up in the solutions.
+        """
+        self._remaining = {word: len(word) for word in self._word_search.solutions}
 
     def _solution(self):
         """
         Command for the "Solution" button. Toggles the solutions on/off when
-        pressed by lighting up the backgrounds of the buttons that contain
+        pressed by lighting up the backgrounds of the cells that contain
         the words in the board.
         """
         if self._solution_shown:
-            bg = "SystemButtonFace"
+            bg = DEFAULT_BG
             state = tk.NORMAL
             self._pushed.clear()
+            self._reset_remaining()
         else:
             bg = self._color
             state = tk.DISABLED
 
         self._solution_shown = not self._solution_shown
         for word, coords in self._word_search.solutions.items():
-            self._labels[word].configure(bg=bg)
+            self._set_label(word, bg=bg)
             for _, col, row in coords:
-                self._buttons[row][col].configure(state=state, bg=bg)
+                self._set_cell(row, col, state=state, bg=bg)
 
-    def _reshuffle(self):
+    def _reshuffle(self, seed=None):
         """
         Command for the "Reshuffle" button. Uses the existing words and
         creates a new word search board with the words in new locations.
+        The board is generated in the background (or taken from the boards
+        prepared ahead of time) and shown once it is ready.
+
+        Parameters
+            seed: Seed for the new board. Default is None, which draws a new
+                  seed from the WordBoard's generator.
+        """
+        if seed is None:
+            self._wait(self._queue.reshuffle(self._words))
+        else:
+            self._wait(self._queue.submit(self._words, seed))
+
+    def _select_new(self):
+        """
+        Command for the "New Words" button. Chooses a new randoms set of
+        words from the file_name file and fills up the board with the new
+        words and displays it in the GUI.
+        """
+        self._wait(self._queue.new_words())
+
+    def _wait(self, future):
+        """
+        Shows the board of a future from the PuzzleQueue right away if it is
+        ready. Otherwise, the GUI is put in a busy state and polled with
+        after() until the board is ready or the user cancels.
+        """
+        if self._pending is not None:
+            self._queue.cancel(self._pending)
+        self._pending = future
+        if future.done():
+            self._poll()
+        else:
+            self._set_busy(True)
+            self._root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        """
+        Checks whether the pending board is ready and shows it if so.
+        """
+        future = self._pending
+        if future is None:
+            return
+        if not future.done():
+            self._root.after(POLL_MS, self._poll)
+            return
+
+        self._pending = None
+        self._set_busy(False)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if isinstance(error, CancelledError):
+            return
+        if error is not None:
+            self._status.configure(text=f"Could not generate board: {error}")
+            return
+        self._show(*future.result())
+
+    def _cancel(self):
+        """
+        Command for the "Cancel" button. Stops the board being generated and
+        keeps the current board.
+        """
+        if self._pending is not None:
+            self._queue.cancel(self._pending)
+            self._pending = None
+        self._set_busy(False)
+
+    def _set_busy(self, busy):
+        """
+        Disables the menu (except "Cancel") while a board is being generated
+        and enables it again afterwards.
+        """
+        state = tk.DISABLED if busy else tk.NORMAL
+        self._new_words_button.configure(
+            state=tk.DISABLED if busy else self._new_words_state
+        )
+        for button in (self._reshuffle_button, self._solution_button):
+            button.configure(state=state)
+        self._export_button.configure(state=state)
+        self._cancel_button.configure(state=tk.NORMAL if busy else tk.DISABLED)
+        self._status.configure(text="Generating..." if busy else "")
+
+    def _show(self, words, word_search):
+        """
+        Displays a new board in the GUI and starts preparing the next boards.
+
+        Parameters
+            words: The words hidden in the board
+            word_search: The WordSearch to display
         """
         self._export_button.configure(text="Export", state=tk.NORMAL)
 
         if self._solution_shown:
             self._solution_shown = not self._solution_shown
-        self._word_search = WordSearch(self._size, self._words)
+        self._word_search = word_search
         self._pushed.clear()
+        self._reset_remaining()
 
-        for i in range(self._size):
-            for j in range(self._size):
-                self._buttons[i][j].configure(
-                    text=self._word_search.board[i][j],
-                    bg="SystemButtonFace",
-                    state=tk.NORMAL,
-                )
+        # Only cells whose letter, background or state changed are reconfigured
+        for i, letters in enumerate(self._word_search.board):
+            for j, letter in enumerate(letters):
+                self._set_cell(i, j, text=letter, bg=DEFAULT_BG, state=tk.NORMAL)
 
-        for label in self._labels.values():
-            label.configure(bg="SystemButtonFace")
+        for word in self._labels:
+            self._set_label(word, bg=DEFAULT_BG)
+        if words != self._words:
+            self._words = words
+            self._create_labels()
 
-    def _select_new(self):
+        self._queue.prefetch(self._words, word_search)
+
+    def _close(self):
         """
-        Command for the "New Words" button. Chooses a new randoms set of
-        words from the file_name file and fills up the board with the new
-        words and displays it in the GUI.
+        Stops generating boards in the background and closes the window.
         """
-        self._choose_random_words()
-        self._reshuffle()
-        self._create_labels()
+        self._queue.shutdown()
+        self._root.destroy()
 
     def _export(self):
         """
@@ -245,91 +603,5 @@ class WordBoard:
         at the bottom of the page.
         """
         self._export_button.configure(state=tk.DISABLED)
-
-        number = 0
-        file_name = "WordSearch.html"
-        while file_name in listdir(getcwd()):
-            number += 1
-            file_name = f"WordSearch{number}.html"
-
-        with open(file_name, mode="w") as f:
-            f.write("<!DOCTYPE html>\n")
-            f.write("<html>\n")
-            f.write("<head>\n")
-            f.write("\t<title>Word Search</title>\n")
-            # Scripts required to display LaTeX
-            f.write(
-                """\t<script type="text/x-mathjax-config">
-                    MathJax.Hub.Config({tex2jax: {inlineMath: [['$','$'], ['\\\\(','\\\\)']]}});
-                    </script>
-                    <script type="text/javascript"
-                    src="http://cdn.mathjax.org/mathjax/latest/MathJax.js?config=TeX-AMS-MML_HTMLorMML">
-                    </script>\n"""
-            )
-            f.write("</head>\n")
-            f.write('<h2 align="center">HTML Table WordSearch Grid:</h2>\n<br><br>')
-
-            # Create HTML Table Version of the Word Search Grid
-            f.write('<table align="center">\n')
-            for i in range(self._size):
-                f.write("\t<tr>\n\t\t")
-                for j in range(self._size):
-                    f.write(f"<td padding=1em>{self._word_search.board[i][j]}</td>")
-                f.write("\t</tr>\n")
-            f.write("</table>\n<br><br>")
-
-            # Create LaTeX Matrix of the Word Search Grid
-            f.write('<h2 align="center">Latex WordSearch Grid:</h2>\n<br><br>')
-            f.write("\\begin{matrix}")
-            f.write(" \\\\ ".join([" & ".join(row) for row in self._word_search.board]))
-            f.write("\\end{matrix}\n<br><br>")
-            f.write('<h2 align="center">WordSearch Grid as String:</h2>\n<br><br>')
-
-            # Create String Version of Word Search Grid. Each Row separated by ':::::'
-            f.write('<div align="center">\n')
-            f.write(
-                " ::: ".join(
-                    ["".join(self._word_search.board[i]) for i in range(self._size)]
-                )
-            )
-            f.write("\n<br><br>\n")
-            f.write(
-                "\n".join(
-                    ["".join(self._word_search.board[i]) for i in range(self._size)]
-                )
-            )
-            f.write("</div>\n")
-
-            # Add solution to the bottom of the file
-            f.write('\n<br><br><h2 align="center">Solution</h2><br><br>\n')
-            f.write("\\begin{matrix}")
-
-            coordinates = set()
-            for coords in self._word_search.solutions.values():
-                for coord in coords:
-                    coordinates.add(coord)
-
-            board = []
-            for i in range(self._size):
-                row = []
-                for j in range(self._size):
-                    if (self._word_search.board[i][j], j, i) in coordinates:
-                        row.append(self._word_search.board[i][j])
-                    else:
-                        row.append("")
-                board.append(row)
-
-            f.write(" \\\\ ".join([" & ".join(row) for row in board]))
-            f.write("\\end{matrix}")
-
-            # Add words used in the Word Search and the size of the board
-            f.write('\n<br><br><h2 align="center">Words</h2><br><br>\n')
-            f.write(
-                f"""<ul align="center"><li>{'</li><li>'.join(self._words)}</li></ul>\n"""
-            )
-            f.write(
-                f'\n<br><br><h2 align="center">SIZE: {self._size}x{self._size}</h2><br><br>\n'
-            )
-            f.write("</html>")
-
+        export(self._word_search)
         self._export_button.configure(text="Exported")
@@ -0,0 +1,151 @@
+"""
+Loads word files (such as words.txt) used to pick random words for Word Search
+boards. Each file is read once and kept sorted by word length, so the words up
+to a given length are always a prefix of the list and can be sampled directly.
+
+dictionary = WordDictionary.load("words.txt")
+words = dictionary.sample(10, max_len=12)
+
+Loaded dictionaries are cached by file path and modification time, so loading
+the same file again returns the same WordDictionary until the file changes.
+
+Alex Eidt
+"""
+
+import os
+from bisect import bisect_right
+from collections import Counter
+from random import Random
+
+
+class WordDictionary:
+    """
+    The WordDictionary holds a list of distinct, uppercased words sorted by
+    length.
+    """
+
+    # Maps the absolute path of each loaded file to a tuple of the file's
+    # (modification time, size) and the WordDictionary loaded from it
+    _cache = {}
+
+    def __init__(self, words):
+        """
+        Initializes a WordDictionary.
+
+        Parameters
+            words: Iterable of words. Words are uppercased and duplicates and
+                   empty strings are removed.
+        """
+        self._words = sorted(set(map(str.upper, filter(None, words))))
+        self._words.sort(key=len)
+        self._lengths = [len(word) for word in self._words]
+        self._letter_frequencies = None
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Loads a file containing words separated by newline (\\n) characters.
+        The file is only read again if it has changed since it was last loaded.
+
+        Parameters
+            file_name: Path of the word file
+
+        Returns
+            The WordDictionary for the file.
+        """
+        path = os.path.abspath(file_name)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = cls._cache.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with open(path, mode="r") as f:
+            dictionary = cls(line.strip() for line in f)
+        cls._cache[path] = (version, dictionary)
+        return dictionary
+
+    def count(self, max_len=None):
+        """
+        Returns the number of words with at most max_len letters, or the number
+        of all words if max_len is None.
+        """
+        if max_len is None:
+            return len(self._words)
+        return bisect_right(self._lengths, max_len)
+
+    def words(self, max_len=None):
+        """
+        Returns a list of the words with at most max_len letters, shortest first.
+        Returns all words if max_len is None.
+        """
+        return self._words[: self.count(max_len)]
+
+    def by_length(self, length):
+        """
+        Returns a list of the words with exactly length letters.
+        """
+        return self._words[self.count(length - 1) : self.count(length)]
+
+    def sample(self, n, max_len=None, rng=None, min_len=None):
+        """
+        Chooses n distinct random words.
+
+        Parameters
+            n: Number of words to choose
+            max_len: Only words with at most max_len letters are chosen. Default is
+                     None (no limit).
+            rng: random.Random instance used to choose the words. Default is None,
+                 which uses a new unseeded generator.
+            min_len: Only words with at least min_len letters are chosen. Default is
+                     None (no limit).
+
+        Returns
+            A list of n distinct words.
+
+        Raises
+            ValueError: If there are fewer than n words with a length in the given
+                        range.
+        """
+        start = 0 if min_len is None else self.count(min_len - 1)
+        stop = self.count(max_len)
+        if n > stop - start:
+            raise ValueError(
+                f"Cannot choose {n} words, only {max(stop - start, 0)} words have "
+                f"between {min_len} and {max_len} letters."
+            )
+        rng = rng or Random()
+        return [self._words[i] for i in rng.sample(range(start, stop), n)]
+
+    @property
+    def letter_frequencies(self):
+        """
+        Maps each letter to the fraction of all letters in the dictionary
+        that it makes up.
+        """
+        if self._letter_frequencies is None:
+            counts = Counter()
+            for word in self._words:
+                counts.update(word)
+            total = sum(counts.values())
+            self._letter_frequencies = {
+                letter: count / total for letter, count in sorted(counts.items())
+            }
+        return self._letter_frequencies
+
+    def __len__(self):
+        """
+        Returns the number of words in the dictionary.
+        """
+        return len(self._words)
+
+    def __contains__(self, word):
+        """
+        Returns True if the word (in any case) is in the dictionary.
+        """
+        word = word.upper()
+        lo = self.count(len(word) - 1)
+        hi = self.count(len(word))
+        i = bisect_right(self._words, word, lo, hi)
+        return i > lo and self._words[i - 1] == word
@@ -0,0 +1,231 @@
+"""
+Finds every occurrence of a list of words in a grid of letters, in all 8
+directions, with an Aho-Corasick automaton built over the words. Each line of
+the grid (rows, columns and both diagonals) is scanned once forwards and once
+backwards, so a scan takes time proportional to the number of cells times the
+number of directions, no matter how many words there are.
+
+scanner = WordScanner(["CAT", "DOG"])
+scanner.count(word_search.board)        # Counter({"CAT": 1, "DOG": 2})
+list(scanner.occurrences(board))        # [("CAT", x, y, dx, dy), ...]
+
+Alex Eidt
+"""
+
+from collections import Counter, deque
+from functools import lru_cache
+
+
+# Character used for empty (None) cells. It never appears in a word, so it
+# sends the automaton back to its start.
+EMPTY = "\0"
+
+# Directions of the lines that are scanned. Each line is also scanned backwards.
+AXES = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+class WordScanner:
+    """
+    The WordScanner is an Aho-Corasick automaton over a list of words that
+    finds the words in grids of letters.
+    """
+
+    def __init__(self, words):
+        """
+        Builds the automaton.
+
+        Parameters
+            words: List of words to search for. Words are uppercased and
+                   duplicates and empty strings are removed.
+        """
+        self.words = sorted(set(map(str.upper, filter(None, words))))
+        self.longest = max(map(len, self.words), default=0)
+        self._palindromes = {word for word in self.words if word == word[::-1]}
+
+        # Trie of the words. State 0 is the start.
+        self._goto = [{}]
+        self._output = [[]]
+        for word in self.words:
+            state = 0
+            for letter in word:
+                if letter not in self._goto[state]:
+                    self._goto[state][letter] = len(self._goto)
+                    self._goto.append({})
+                    self._output.append([])
+                state = self._goto[state][letter]
+            self._output[state].append(word)
+
+        # Failure links, found breadth first. Each state's output is merged
+        # with the output of its failure state.
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for letter, child in self._goto[state].items():
+                queue.append(child)
+                fail = self._fail[state]
+                while fail and letter not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(letter, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+    def _transition(self, state, letter):
+        """
+        Finds the state the automaton moves to from state on letter by following
+        failure links. The result is stored as an edge of the trie so that the
+        same transition is a single lookup from then on.
+        """
+        goto = self._goto
+        target = state
+        while target and letter not in goto[target]:
+            target = self._fail[target]
+        goto[state][letter] = goto[target].get(letter, 0)
+        return goto[state][letter]
+
+    def scan(self, text):
+        """
+        Finds every occurrence of the words in a string.
+
+        Parameters
+            text: String to scan
+
+        Returns
+            A generator of (start index, word) tuples.
+        """
+        goto = self._goto
+        output = self._output
+        state = 0
+        for i, letter in enumerate(text):
+            next_state = goto[state].get(letter)
+            if next_state is None:
+                next_state = self._transition(state, letter)
+            state = next_state
+            if output[state]:
+                for word in output[state]:
+                    yield i - len(word) + 1, word
+
+    @staticmethod
+    def lines(board):
+        """
+        Yields every line of a grid in the directions of AXES.
+
+        Parameters
+            board: 2D list of letters indexed as board[y][x]. Empty cells are None.
+
+        Returns
+            A generator of (x, y, dx, dy, text) tuples, where (x, y) is the first
+            cell of the line and text holds its letters.
+        """
+        rows = ["".join([letter or EMPTY for letter in row]).upper() for row in board]
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        for y, row in enumerate(rows):
+            yield 0, y, 1, 0, row
+        for x, column in enumerate(zip(*rows)):
+            yield x, 0, 0, 1, "".join(column)
+
+        for dy in (1, -1):
+            if dy == 1:
+                starts = [(0, y) for y in range(height - 1, 0, -1)]
+                starts += [(x, 0) for x in range(width)]
+            else:
+                starts = [(0, y) for y in range(height)]
+                starts += [(x, height - 1) for x in range(1, width)]
+            for x, y in starts:
+                length = min(width - x, height - y if dy == 1 else y + 1)
+                text = "".join([rows[y + k * dy][x + k] for k in range(length)])
+                yield x, y, 1, dy, text
+
+    def occurrences(self, board):
+        """
+        Finds every occurrence of the words in a grid, in all 8 directions.
+        Palindromes are only reported once per set of cells, and single letter
+        words once per cell (in the first direction of AXES).
+
+        Parameters
+            board: 2D list of letters indexed as board[y][x]. Empty cells are None.
+
+        Returns
+            A generator of (word, x, y, dx, dy) tuples giving each word's first
+            cell and direction.
+        """
+        for x, y, dx, dy, text in self.lines(board):
+            for start, word in self.scan(text):
+                if len(word) > 1 or (dx, dy) == AXES[0]:
+                    yield word, x + start * dx, y + start * dy, dx, dy
+            last = len(text) - 1
+            for start, word in self.scan(text[::-1]):
+                if word in self._palindromes:
+                    continue
+                index = last - start
+                yield word, x + index * dx, y + index * dy, -dx, -dy
+
+    def count(self, board):
+        """
+        Counts the occurrences of each word in a grid.
+
+        Returns
+            A Counter mapping each word found to its number of occurrences.
+        """
+        return Counter(word for word, *_ in self.occurrences(board))
+
+    def touches(self, board, x, y):
+        """
+        Determines if any word occurs in a line through the cell (x, y) and
+        covers that cell. Only the letters within reach of the longest word are
+        scanned, so this is used to check a single cell as it is filled in.
+
+        Parameters
+            board: 2D list of letters indexed as board[y][x]. Empty cells are None.
+            x, y: Coordinates of the cell
+
+        Returns
+            True if an occurrence covers the cell, False otherwise.
+        """
+        height = len(board)
+        width = len(board[0])
+        reach = self.longest - 1
+        for dx, dy in AXES:
+            # Walk back to the first cell of the segment around (x, y)
+            before = 0
+            while (
+                before < reach
+                and 0 <= x - (before + 1) * dx < width
+                and 0 <= y - (before + 1) * dy < height
+                and board[y - (before + 1) * dy][x - (before + 1) * dx]
+            ):
+                before += 1
+            letters = []
+            i, j = x - before * dx, y - before * dy
+            while (
+                len(letters) <= before + reach
+                and 0 <= i < width
+                and 0 <= j < height
+                and board[j][i]
+            ):
+                letters.append(board[j][i])
+                i += dx
+                j += dy
+            text = "".join(letters)
+            for start, word in self.scan(text):
+                if start <= before < start + len(word):
+                    return True
+            last = len(text) - 1
+            for start, word in self.scan(text[::-1]):
+                if start <= last - before < start + len(word):
+                    return True
+
+        return False
+
+
+@lru_cache(maxsize=32)
+def cached_scanner(words):
+    """
+    Returns a WordScanner for a tuple of words, reusing scanners that were built
+    for the same words before.
+    """
+    return WordScanner(words)
@@ -9,10 +9,64 @@ word_search = WordSearch()
 2d_board = word_search.board
 solutions = word_search.solutions
 
+The smallest board size a list of words fits on can be found with:
+
+size = minimum_size(words)
+
 Alex Eidt
 """
 
-from random import choice, shuffle
+from concurrent.futures import CancelledError
+from copy import copy
+from functools import lru_cache
+from math import ceil, sqrt
+from random import Random
+from time import perf_counter
+from Grid import LETTERS, ListGrid, ArrayGrid, BitboardGrid, most_shared
+from PuzzleCache import PuzzleCache, cache_key
+from Solutions import Solutions
+from WordScanner import cached_scanner
+from WordSearchStats import WordSearchStats
+
+
+# Number of times (per word) a placed word may be taken back off the board
+# before the set of words is reported as not fitting on the board.
+MAX_EVICTIONS = 50
+
+# Largest number of evictions for any number of words, so that sets of words
+# that do not fit are given up on in a bounded time.
+EVICTION_LIMIT = 2000
+
+# Orders in which words can be placed on the board. See WordSearch.__init__.
+ORDERS = ("random", "longest", "constrained")
+
+# Ways of choosing among the placements that fit. See WordSearch.__init__.
+PLACEMENTS = ("uniform", "overlap")
+
+# Ways of filling the cells not covered by words. See WordSearch.__init__.
+FILLERS = ("random", "safe")
+
+# Storage backends of the board. See WordSearch.__init__.
+BACKENDS = {"list": ListGrid, "numpy": ArrayGrid, "bitboard": BitboardGrid}
+
+# Step size in the x and y direction of each direction a word can be placed in
+DIRECTIONS = {
+    "right": (1, 0),
+    "down": (0, 1),
+    "up_right": (1, -1),
+    "down_right": (1, 1),
+    "left": (-1, 0),
+    "up": (0, -1),
+    "down_left": (-1, 1),
+    "up_left": (-1, -1),
+}
+
+# Directions words are placed in at each difficulty. See WordSearch.__init__.
+DIFFICULTIES = {
+    "easy": ("right", "down"),
+    "medium": ("right", "down", "up_right", "down_right"),
+    "hard": tuple(DIRECTIONS),
+}
 
 
 class WordSearch:
@@ -22,16 +76,102 @@ class WordSearch:
     and then fills the rest of the empty spaces with random letters.
     """
 
-    def __init__(self, size, words):
+    def __init__(
+        self,
+        size,
+        words,
+        backend="bitboard",
+        timeout=None,
+        seed=None,
+        stats=False,
+        order="random",
+        placement="uniform",
+        density=None,
+        filler="random",
+        blocklist=(),
+        directions="medium",
+        cache=None,
+        cancel=None,
+    ):
         """
         Initializes an instances of a WordSearch class.
 
         Parameters
             size: Size of the board. Board will always be a square of size x size letters
             words: List of words to be hidden in the word search
+            backend: How the letters of the board are stored. "list" stores them
+                     as a list of lists. "numpy" stores them in a NumPy uint8 array
+                     so that fit checks and filling are vectorized (requires NumPy
+                     and words made up of characters with codes below 256).
+                     "bitboard" keeps one bitboard per letter so that every
+                     placement of a word in a direction that fits is found with
+                     one shift and AND per letter, and builds the same boards as
+                     "list" for the same seed. Default is "bitboard", which
+                     is by far the fastest on large, sparse boards.
+            timeout: Maximum number of seconds to spend placing words. Default is
+                     None (no limit).
+            seed: Seed for the random number generator, or a random.Random instance
+                  to draw from. The same size, words and seed always produce the
+                  same board and solutions. Default is None (unseeded).
+            stats: True to record how the board was generated in self.stats as a
+                   WordSearchStats, or a WordSearchStats instance (or subclass) to
+                   record into. Default is False, which records nothing and leaves
+                   self.stats as None.
+            order: Order in which the words are placed on the board.
+                   "random" places them in random order.
+                   "longest" places the longest words first, while the board is
+                   still empty.
+                   "constrained" places the word with the fewest placements that
+                   fit the board next, recounted after every placement. This
+                   makes the fewest evictions on crowded boards, but finds the
+                   placements of every remaining word for each word placed.
+                   A function taking the list of words and the random.Random
+                   instance and returning the words in the order to place them
+                   may also be given. Default is "random".
+            placement: How a word's placement is chosen among the ones that fit.
+                       "uniform" picks one uniformly at random. "overlap" picks
+                       uniformly among the placements that share the most letters
+                       with the words already on the board, for compact boards.
+                       Default is "uniform".
+            density: Target number of word letters per covered cell for the
+                     "overlap" placement (1 means no shared letters). Placements
+                     with the most overlap are only preferred while the board is
+                     below the target. Default is None, which always prefers them.
+            filler: How the cells not covered by words are filled in.
+                    "random" picks each letter uniformly at random.
+                    "safe" picks each letter at random among the ones that do not
+                    spell a hidden word or a blocklisted word through that cell in
+                    any of the 8 directions, so every hidden word appears exactly
+                    once (unless the words themselves spell each other).
+                    Default is "random".
+            blocklist: Words that the "safe" filler never spells. Default is empty.
+            directions: Directions words may be placed in, either the name of a
+                        difficulty in DIFFICULTIES or a list of names from
+                        DIRECTIONS. "easy" only places words left to right and
+                        top to bottom, "medium" adds the two diagonals going
+                        right and "hard" allows all 8 directions, including
+                        words written backwards. Default is "medium".
+            cache: A PuzzleCache, or the path of its directory, to read the board
+                   from and store it in. Boards are only cached when seed is an
+                   int or a String and order is not a function, since any other
+                   board cannot be generated the same way again. On a hit the
+                   board is loaded without generating it. Default is None.
+            cancel: A threading.Event, or a function returning True, that stops
+                    placing words once it is set, for example from another
+                    thread. Default is None (never cancelled).
+
+        Raises
+            ValueError: If the words cannot all be placed on a board of the given size.
+            TimeoutError: If placing the words takes longer than timeout seconds.
+            CancelledError: If cancel is set while placing the words.
         """
+        start = perf_counter()
         self._size = size
-        self._words = list(set(map(str.upper, words)))
+        # Sorted so that the order of the words does not depend on string hashing
+        self._prepared = sorted(set(map(str.upper, words)))
+        self._words = list(self._prepared)
+        self.seed = seed
+        self._random = seed if isinstance(seed, Random) else Random(seed)
 
         # Check to see if the longest word in the words list is
         # less than the size of the board + 2 to ensure that
@@ -40,63 +180,180 @@ class WordSearch:
             self._size - max(map(len, self._words)) > 2
         ), f"Board Size {self._size} is too small."
 
-        shuffle(self._words)
-        self.board = [[None for _ in range(self._size)] for _ in range(self._size)]
+        self._order = order
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Unknown placement {placement!r}.")
+        self._scored = placement == "overlap"
+        if filler not in FILLERS:
+            raise ValueError(f"Unknown filler {filler!r}.")
+        self._filler = filler
+        self._blocklist = blocklist
+        self._density = density
+        self._steps = _direction_steps(directions)
+        # Each cell holds one letter, which at most one word per direction
+        # passes through, so a set of words with more letters than that can
+        # never fit and is rejected before trying to place it.
+        if sum(map(len, self._words)) > size * size * len(self._steps):
+            raise ValueError(
+                f"{len(self._words)} words have too many letters for a "
+                f"{size}x{size} board."
+            )
+        # Maps each word length to its orientations, see _get_orientations
+        self._orientations = {}
+        # Total number of letters in the words on the board
+        self._letters = 0
+        self._words = self._order_words(order)
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown board backend {backend!r}.")
+        if backend == "numpy" and not ArrayGrid.supports(self._words):
+            raise ValueError("The numpy backend only supports 8-bit characters.")
+        self._backend = backend
+        self._grid = BACKENDS[backend](self._size)
 
         # Solutions is a mapping of words hidden in the board to a set of coordinates
-        # of each letter in these words
-        self.solutions = {}
+        # of each letter in these words. It also records which words cover each cell.
+        self.solutions = Solutions(self._size)
+
+        self._timeout = timeout
+        self._cancel = getattr(cancel, "is_set", cancel)
+        if stats is True:
+            stats = WordSearchStats()
+        self.stats = stats or None
+
+        if isinstance(cache, str):
+            cache = PuzzleCache(cache)
+        self._cache = None if callable(order) else cache
+        # Options that change the board, part of the cache key
+        self._cache_options = {
+            "backend": backend,
+            "order": order,
+            "placement": placement,
+            "density": density,
+            "filler": filler,
+            "blocklist": sorted(set(map(str.upper, blocklist))),
+            "directions": directions,
+        }
+
+        self._generate(start)
+
+    def _generate(self, start):
+        """
+        Fills the board with the words and then with random letters, or reads
+        it from the cache.
+
+        Parameters
+            start: perf_counter() value generation started at, for the stats
+
+        Raises
+            ValueError: If the words cannot all be placed on the board.
+            TimeoutError: If placing the words takes longer than the timeout.
+            CancelledError: If the board is cancelled while placing the words.
+        """
+        self._deadline = (
+            None if self._timeout is None else perf_counter() + self._timeout
+        )
+        cache = self._cache
+        key = None
+        if (
+            cache is not None
+            and isinstance(self.seed, (int, str))
+            and not isinstance(self.seed, bool)
+        ):
+            key = cache_key(self._size, self._words, self.seed, self._cache_options)
 
         # Fill the board with words
-        check = False
-        while not check:
-            self._init_board()
-            check = self._fill_with_words()
+        self._init_board()
+        layout = None if key is None else cache.get(key)
+        if layout is None or not self._from_layout(*layout):
+            if not self._fill_with_words():
+                raise ValueError(
+                    f"Could not place all {len(self._words)} words on a "
+                    f"{self._size}x{self._size} board."
+                )
+
+            fill_start = perf_counter()
+            self._fill_board()
+            if self.stats is not None:
+                self.stats.on_fill(perf_counter() - fill_start)
+            if key is not None:
+                cache.put(
+                    key,
+                    self.board,
+                    [
+                        (word, *placement[:4])
+                        for word, placement in self.solutions.placements()
+                    ],
+                )
+
+        if self.stats is not None:
+            self.stats.on_done(
+                self.solutions.covered_count(),
+                self._size**2,
+                self._letters,
+                perf_counter() - start,
+            )
+
+    def reshuffle(self, seed=None, cancel=None):
+        """
+        Creates a new board with the same words and options as this one. The
+        prepared word list, its validation and the placement tables of this
+        board are reused, and the result is the same board as
+        WordSearch(size, words, seed=seed, ...) with the same options.
+
+        Parameters
+            seed: Seed of the new board. Default is None (unseeded).
+            cancel: Stops building the new board once set, see __init__.
+                    Default is None (never cancelled).
 
-        self._fill_board()
+        Returns
+            The new WordSearch.
 
-    def _get_orientation(self, word_len):
+        Raises
+            ValueError: If the words cannot all be placed on the board.
+            TimeoutError: If placing the words takes longer than the timeout.
+            CancelledError: If cancel is set while placing the words.
+        """
+        start = perf_counter()
+        other = copy(self)
+        other.seed = seed
+        other._cancel = getattr(cancel, "is_set", cancel)
+        other._random = seed if isinstance(seed, Random) else Random(seed)
+        other._letters = 0
+        other._words = list(self._prepared)
+        other._words = other._order_words(self._order)
+        other._grid = BACKENDS[self._backend](self._size)
+        other.solutions = Solutions(self._size)
+        other.stats = None if self.stats is None else type(self.stats)()
+        other._generate(start)
+        return other
+
+    def _get_orientations(self, word_len):
         """
-        Gets the orientation and starting point of a word.
-        Refers to the starting (x, y) coordinate and the steps (ox, oy)
-        for a given word.
+        Gets every orientation a word may be placed in along with the range
+        of valid starting points for each. The orientations are only computed
+        once for each word length.
 
         Parameters
-            word_len: The length of the word that the "stats" are being
+            word_len: The length of the word that the orientations are being
                       found for
 
         Returns
-            A tuple containing the starting coordinates and the step size
-            in the x and y direction.
-        """
-        starty = startx = 0
-        endy = endx = self._size
-
-        orient = choice(range(0, 4))
-
-        if orient == 0:  # Horizontal
-            ox = 1
-            oy = 0
-            endx = self._size - word_len  # board columns - word_len
-        elif orient == 1:  # Vertical Down
-            ox = 0
-            oy = 1
-            endy = self._size - word_len  # board rows - word_len
-        elif orient == 2:  # Upward Diagonal
-            ox = 1
-            oy = -1
-            starty = word_len
-            endx = self._size - word_len  # board columns - word_len
-        elif orient == 3:  # Downward Diagonal
-            ox = 1
-            oy = 1
-            endy = self._size - word_len
-            endx = self._size - word_len  # board columns - word_len
-
-        x = choice(range(startx, endx))
-        y = choice(range(starty, endy))
-
-        return x, y, ox, oy
+            A list of tuples (ox, oy, xs, ys) containing the step size in the
+            x and y direction and the ranges of starting x and y coordinates.
+        """
+        orientations = self._orientations.get(word_len)
+        if orientations is None:
+            size = self._size
+            # Starting coordinates along an axis for a step of 0, 1 and -1
+            starts = {
+                0: range(0, size),
+                1: range(0, size - word_len + 1),
+                -1: range(word_len - 1, size),
+            }
+            orientations = [(ox, oy, starts[ox], starts[oy]) for ox, oy in self._steps]
+            self._orientations[word_len] = orientations
+
+        return orientations
 
     def _check_board(self, word, x, y, ox, oy):
         """
@@ -115,85 +372,318 @@ class WordSearch:
             True if the word can be placed at the proposed location, False
             otherwise.
         """
+        return self._grid.fits(word, x, y, ox, oy)
+
+    def _candidates(self, word):
+        """
+        Finds every placement of a word that fits on the current board.
+
+        Parameters
+            word: The word that the placements are being found for
+
+        Returns
+            A list of (x, y, ox, oy) tuples, one for each placement where every
+            letter of the word is either on an empty cell or on the same letter.
+            For the "overlap" placement, each tuple starts with the number of
+            letters the placement shares with the board.
+        """
+        return self._grid.candidates(
+            word, self._get_orientations(len(word)), scored=self._scored
+        )
+
+    def _choose(self, candidates):
+        """
+        Chooses one of the placements returned by _candidates.
+
+        Returns
+            The chosen (x, y, ox, oy) placement.
+        """
+        if not self._scored:
+            return self._random.choice(candidates)
+
+        covered = self.solutions.covered_count()
+        if (
+            self._density is None
+            or not covered
+            or self._letters / covered < self._density
+        ):
+            candidates = most_shared(candidates)
+        return self._random.choice(candidates)[1:]
+
+    def _blocking_words(self, word, x, y, ox, oy):
+        """
+        Finds the words on the board that stop a word from being placed at the
+        given location.
+
+        Parameters
+            word: The word that could be placed at the given coordinates
+            x, y: Starting coordinates of the word
+            ox, oy: Step size in the x and y direction
+
+        Returns
+            A set of the placed words that cover a cell of the proposed location
+            with a different letter.
+        """
+        blocking = set()
         for i, letter in enumerate(word):
             x_coord = x + i * ox
             y_coord = y + i * oy
-            if self.board[y_coord][x_coord] != letter and self.board[y_coord][x_coord]:
-                return False
+            current = self._grid.get(x_coord, y_coord)
+            if current and current != letter:
+                blocking.update(self.solutions.words_at(x_coord, y_coord))
 
-        return True
+        return blocking
 
-    def _add_word(self, word):
+    def _least_blocked(self, word):
         """
-        Adds a word to the Word Search board.
+        Finds the placement of a word that is blocked by the fewest placed words,
+        chosen uniformly at random among them. The blocking words are counted
+        one orientation at a time, checking the timeout and cancel in between.
 
         Parameters
-            word: The word being placed on the Word Search Board.
+            word: The word that the placement is being found for
 
         Returns
-            False if the word could not be placed on the board (ran into
-            infinite loop). True if the word can be placed on the board.
-        """
-        x, y, ox, oy = self._get_orientation(len(word))
-        # Check to see if the randomly picked location from getStats is
-        # viable for the given word. If not, it will continue to check
-        # until a spot has been found.
-
-        # Count exists to prevent an infinite loop from occurring.
-        # Especially with small board sizes, it's possible that due to
-        # the random placement of the words, the algorithm runs out
-        # of valid spots for the word. The way to solve this is to
-        # arbitrarily choose a large number and check if the number
-        # of iterations has exceeded it.
-        count = 0
-        while not self._check_board(word, x, y, ox, oy):
-            x, y, ox, oy = self._get_orientation(len(word))
-            count += 1
-            # Check for infinite loop
-            if count > 20000:
-                return False
+            A tuple containing the (x, y, ox, oy) placement and the set of words
+            blocking it.
 
-        self.solutions[word] = set()
+        Raises
+            TimeoutError: If the timeout passes while counting the blocking words.
+            CancelledError: If cancel is set while counting the blocking words.
+        """
+        best = []
+        fewest = None
+        for orientation in self._get_orientations(len(word)):
+            self._check_stop()
+            blocking, placements = self.solutions.fewest_blocking(word, [orientation])
+            if not placements:
+                continue
+            if fewest is None or blocking < fewest:
+                fewest = blocking
+                best = []
+            if blocking == fewest:
+                best.append(placements)
+
+        index = self._random.randrange(sum(map(len, best)))
+        for placements in best:
+            if index < len(placements):
+                placement = placements[index]
+                break
+            index -= len(placements)
+
+        return placement, self._blocking_words(word, *placement)
+
+    def _check_stop(self):
+        """
+        Raises a TimeoutError if the timeout has passed, or a CancelledError if
+        cancel is set.
+        """
+        if self._deadline is not None and perf_counter() > self._deadline:
+            raise TimeoutError(
+                f"Placing {len(self._words)} words on a "
+                f"{self._size}x{self._size} board timed out."
+            )
+        if self._cancel is not None and self._cancel():
+            raise CancelledError(
+                f"Placing {len(self._words)} words on a "
+                f"{self._size}x{self._size} board was cancelled."
+            )
+
+    def _add_word(self, word, x, y, ox, oy):
+        """
+        Adds a word to the Word Search board at the given placement.
+
+        Parameters
+            word: The word being placed on the Word Search Board.
+            x, y: Starting coordinates of the word
+            ox, oy: Step size in the x and y direction
+        """
         for i, letter in enumerate(word):
-            x_coord = x + i * ox
-            y_coord = y + i * oy
-            self.board[y_coord][x_coord] = letter
-            self.solutions[word].add((letter, x_coord, y_coord))
+            self._grid.set(x + i * ox, y + i * oy, letter)
+        self.solutions.add(word, x, y, ox, oy)
+        self._letters += len(word)
 
-        return True
+        if self.stats is not None:
+            self.stats.on_place(word, x, y, ox, oy)
+
+    def _remove_word(self, word):
+        """
+        Takes a word back off the Word Search board. Letters shared with
+        other words stay on the board.
+
+        Parameters
+            word: The word being removed from the Word Search Board.
+        """
+        for x_coord, y_coord in self.solutions.remove(word):
+            self._grid.set(x_coord, y_coord, None)
+        self._letters -= len(word)
 
     def _fill_board(self):
         """
         Fills all empty locations of the board with random letters.
         """
-        for i in range(self._size):
-            for j in range(self._size):
-                if not self.board[i][j]:
-                    self.board[i][j] = choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+        if self._filler == "safe":
+            self._safe_fill()
+        else:
+            self._grid.fill(self._random)
+
+    def _safe_fill(self):
+        """
+        Fills all empty locations of the board with random letters that do not
+        spell a hidden or blocklisted word. Cells are filled one at a time and
+        each letter tried is checked with a WordScanner along the 4 lines
+        through its cell, so only words covering a filled cell are ever found.
+        Words spelled by the hidden words alone are left as they are. If every
+        letter spells a word (which only happens with a very large blocklist),
+        the last one tried is kept.
+        """
+        rows = [list(row) for row in self._grid.rows()]
+        safe_fill(rows, self._random, self._scanner_words())
+        self._grid.paste(0, 0, rows)
+
+    def _scanner_words(self):
+        """
+        Returns the sorted tuple of the words the "safe" filler never spells.
+        """
+        return tuple(sorted(set(self._words).union(map(str.upper, self._blocklist))))
+
+    def _from_layout(self, board, placements):
+        """
+        Restores a board read from a PuzzleCache instead of generating it.
+
+        Parameters
+            board: The board as a list of lists of letters
+            placements: List of (word, x, y, dx, dy) placements
+
+        Returns
+            True if the board was restored, False if it does not match the size
+            and words of this WordSearch (and nothing was changed).
+        """
+        if len(board) != self._size or sorted(
+            word for word, *_ in placements
+        ) != sorted(self._words):
+            return False
+
+        # Written in one step, since setting the cells one at a time rewrites
+        # the whole bitboards of the bitboard backend for every cell
+        self._grid.paste(0, 0, board)
+        for word, x, y, dx, dy in placements:
+            self.solutions.add(word, x, y, dx, dy)
+            self._letters += len(word)
+
+        return True
 
     def _init_board(self):
         """
         Initializes every location of the board to be None.
         """
-        for i in range(self._size):
-            for j in range(self._size):
-                self.board[i][j] = None
+        self._grid.clear()
+
+    def _order_words(self, order):
+        """
+        Orders the words in the order they will be placed on the board.
+
+        Parameters
+            order: One of ORDERS or a function, see __init__
+
+        Returns
+            The ordered list of words. For "constrained", the order is only used
+            to break ties.
+        """
+        words = list(self._words)
+        self._random.shuffle(words)
+        if callable(order):
+            return list(order(words, self._random))
+        if order not in ORDERS:
+            raise ValueError(f"Unknown word order {order!r}.")
+        if order == "longest":
+            words.sort(key=len, reverse=True)
+        return words
+
+    def _next_word(self, pending):
+        """
+        Takes the next word to place off the list of pending words.
+
+        Parameters
+            pending: List of the words left to place. The next word is at the end
+                     unless the order is "constrained".
 
-    def _fill_with_words(self):
+        Returns
+            A tuple of the word and the list of its placements that fit the board.
+        """
+        stats = self.stats
+        if self._order != "constrained":
+            pending = [pending.pop()]
+
+        best = None
+        for i, word in enumerate(pending):
+            if stats is not None:
+                start = perf_counter()
+            candidates = self._candidates(word)
+            if stats is not None:
+                stats.on_check(word, len(candidates), perf_counter() - start)
+            if best is None or len(candidates) < len(best[2]):
+                best = (i, word, candidates)
+                if not candidates:
+                    break
+
+        if self._order == "constrained":
+            del pending[best[0]]
+        return best[1], best[2]
+
+    def _fill_with_words(self, words=None):
         """
         Fills the board with the given list of words.
 
+        Words are placed in the order given to __init__. Each word is placed
+        uniformly at random among the placements that fit the board at that
+        point. If a word has nowhere left to go, it is
+        placed where it is blocked by the fewest words, and only those words
+        are taken off the board and placed again, instead of starting the
+        whole board over.
+
+        Parameters
+            words: The ordered list of words to place. Default is None, which
+                   places every word of the board.
+
         Returns
-            False if one of the words could not be added to the board.
-            True if all words have been successfully added to the board.
+            False if the words could not all be added to the board within the
+            eviction budget. True if all words have been successfully added
+            to the board.
         """
-        for word in self._words:
-            check = self._add_word(word)
-            if not check:
+        stats = self.stats
+        pending = (self._words if words is None else words)[::-1]
+        evictions = 0
+        while pending:
+            self._check_stop()
+            word, candidates = self._next_word(pending)
+            if candidates:
+                self._add_word(word, *self._choose(candidates))
+                continue
+
+            evictions += 1
+            if evictions > min(MAX_EVICTIONS * len(self._words), EVICTION_LIMIT):
                 return False
+            if stats is not None:
+                start = perf_counter()
+            placement, blocking = self._least_blocked(word)
+            evicted = sorted(blocking)
+            for other in evicted:
+                self._remove_word(other)
+                pending.append(other)
+            if stats is not None:
+                stats.on_evict(word, evicted, perf_counter() - start)
+            self._add_word(word, *placement)
 
         return True
 
+    @property
+    def board(self):
+        """
+        The board as a 2D list of letters, indexed as board[y][x].
+        """
+        return self._grid.rows()
+
     def __len__(self):
         """
         Returns the length of one side of the board.
@@ -205,3 +695,202 @@ class WordSearch:
         Returns Word Search Board as a String.
         """
         return "\n".join([" ".join(row) for row in self.board])
+
+
+def layouts(
+    size, words, seed=None, count=None, min_difference=0.0, attempts=100, **options
+):
+    """
+    Lazily generates distinct boards for one list of words, such as variants of
+    a worksheet. The words are prepared and validated once and the placement
+    tables are shared by every board (see WordSearch.reshuffle).
+
+    No layout (the placements of all of the words) is ever yielded twice. Each
+    board is reproducible on its own as WordSearch(size, words, seed=board.seed,
+    **options).
+
+    Parameters
+        size: Size of the boards
+        words: List of words to hide in every board
+        seed: Seed for the seeds of the boards, or a random.Random instance to
+              draw them from. Default is None (unseeded).
+        count: Number of boards to generate. Default is None, which generates
+               boards until no new one is found.
+        min_difference: Minimum fraction (0 to 1) of the words that must be
+                        placed differently from the previous board. Default is
+                        0.0, which only requires the layouts to be distinct.
+        attempts: Number of boards tried for each board yielded. The stream ends
+                  early if none of them is new and different enough.
+                  Default is 100.
+        options: Keyword arguments passed on to WordSearch
+
+    Returns
+        A generator of WordSearch instances.
+
+    Raises
+        ValueError: If the first board cannot be generated.
+    """
+    rng = seed if isinstance(seed, Random) else Random(seed)
+    template = WordSearch(size, words, seed=rng.getrandbits(32), **options)
+    seen = set()
+    previous = None
+    board = template
+    while count is None or len(seen) < count:
+        for _ in range(attempts):
+            if board is None:
+                try:
+                    board = template.reshuffle(
+                        rng.getrandbits(32), options.get("cancel")
+                    )
+                except (ValueError, TimeoutError):
+                    continue
+            layout = dict(board.solutions.placements())
+            key = frozenset(layout.items())
+            different = previous is None or sum(
+                placement != previous[word] for word, placement in layout.items()
+            ) >= min_difference * len(layout)
+            if key not in seen and different:
+                break
+            board = None
+        else:
+            return
+
+        seen.add(key)
+        previous = layout
+        yield board
+        board = None
+
+
+def safe_fill(rows, rng, words, xs=None, ys=None):
+    """
+    Fills the empty cells of a board with random letters that do not spell any
+    of the given words. Cells are filled one at a time and each letter tried is
+    checked with a WordScanner along the 4 lines through its cell. If every
+    letter spells a word, the last one tried is kept.
+
+    Parameters
+        rows: The board as a list of lists of letters, filled in place. Empty
+              cells are None.
+        rng: random.Random instance used to pick the letters
+        words: Sorted tuple of uppercased words to avoid
+        xs, ys: Ranges of the x and y coordinates of the cells to fill.
+                Default is None, which fills the whole board.
+    """
+    scanner = cached_scanner(words)
+    letters = list(LETTERS)
+    for y in range(len(rows)) if ys is None else ys:
+        row = rows[y]
+        for x in range(len(row)) if xs is None else xs:
+            if row[x]:
+                continue
+            rng.shuffle(letters)
+            for letter in letters:
+                row[x] = letter
+                if not scanner.touches(rows, x, y):
+                    break
+
+
+def _direction_steps(directions):
+    """
+    Returns the list of (dx, dy) step sizes of the given directions, either the
+    name of a difficulty in DIFFICULTIES or a list of names from DIRECTIONS.
+
+    Raises
+        ValueError: If a difficulty or direction is unknown or no direction
+                    is given.
+    """
+    if isinstance(directions, str):
+        if directions not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty {directions!r}.")
+        directions = DIFFICULTIES[directions]
+    if not directions:
+        raise ValueError("At least one direction is required.")
+    for direction in directions:
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction {direction!r}.")
+
+    return [DIRECTIONS[direction] for direction in directions]
+
+
+def minimum_size(words, attempts=3, max_overlap=1.0, timeout=None, seed=0, **options):
+    """
+    Finds the smallest board size that all of the given words can be placed on.
+
+    The search starts from two cheap lower bounds: the longest word must be at
+    least 3 letters shorter than the board, and the board must have enough cells
+    for every letter (divided by max_overlap). Sizes are then binary searched up
+    to a size that always fits (one word per row or column, or a size found by
+    doubling when only diagonal directions are allowed). A size counts as
+    feasible as soon as one of attempts boards is generated, so the result is
+    the smallest size found to fit rather than a proof that smaller sizes do not.
+
+    Results are cached per set of words and options.
+
+    Parameters
+        words: List of words
+        attempts: Number of boards tried for each size. Default is 3.
+        max_overlap: Expected number of word letters per covered cell, used to
+                     lower the cell count bound when words share letters (e.g.
+                     with placement="overlap"). Default is 1.0.
+        timeout: Maximum number of seconds spent on each attempt. Default is None
+                 (no limit besides the eviction budget).
+        seed: Seed for the attempts, so that the search is reproducible.
+              Default is 0.
+        options: Keyword arguments passed on to WordSearch
+
+    Returns
+        The smallest board size found to fit all of the words.
+    """
+    words = tuple(sorted(set(map(str.upper, words))))
+    # Options are part of the cache key, so lists and sets become tuples. The
+    # order of directions is kept since it changes the boards.
+    for name, value in options.items():
+        if isinstance(value, (set, frozenset)):
+            options[name] = tuple(sorted(value))
+        elif isinstance(value, list):
+            options[name] = tuple(value if name == "directions" else sorted(value))
+    return _minimum_size(
+        words, attempts, max_overlap, timeout, seed, tuple(sorted(options.items()))
+    )
+
+
+@lru_cache(maxsize=1024)
+def _minimum_size(words, attempts, max_overlap, timeout, seed, options):
+    """
+    Cached implementation of minimum_size. words is a sorted tuple of distinct
+    uppercased words and options is a sorted tuple of (name, value) pairs.
+    """
+    options = dict(options)
+    longest = max(map(len, words))
+    letters = sum(map(len, words))
+    low = max(longest + 3, ceil(sqrt(letters / max_overlap)))
+    high = max(low, len(words))
+    steps = _direction_steps(options.get("directions", "medium"))
+
+    def fits(size):
+        rng = Random(seed)
+        for _ in range(attempts):
+            try:
+                WordSearch(
+                    size, words, timeout=timeout, seed=rng.getrandbits(32), **options
+                )
+                return True
+            except (ValueError, TimeoutError):
+                pass
+        return False
+
+    # If words can be placed horizontally or vertically, every word fits on its
+    # own row or column at this size. Otherwise grow the board until they fit.
+    if not any(0 in step for step in steps):
+        while not fits(high):
+            low = high + 1
+            high *= 2
+
+    while low < high:
+        size = (low + high) // 2
+        if fits(size):
+            high = size
+        else:
+            low = size + 1
+
+    return low
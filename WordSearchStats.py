@@ -0,0 +1,126 @@
+"""
+Records how a WordSearch board was generated. Pass stats=True (or an instance
+of WordSearchStats or a subclass of it) to WordSearch and read the results from
+word_search.stats after construction:
+
+word_search = WordSearch(16, words, stats=True)
+print(word_search.stats)
+
+The on_* methods are called by WordSearch while it generates the board, so a
+subclass can override them to observe generation as it happens.
+
+Alex Eidt
+"""
+
+
+class WordSearchStats:
+    """
+    The WordSearchStats class holds the measurements of one WordSearch generation.
+
+    Attributes
+        attempts: Maps each word to the number of times it was placed on the board
+        candidates: Maps each word to the number of placements that fit the board
+                    the last time it was placed
+        evictions: Number of times a word had nowhere to go and the words blocking
+                   it were taken off the board
+        replaced: Number of words taken off the board and placed again
+        check_time: Seconds spent finding placements that fit the board
+        fill_time: Seconds spent filling the empty cells with random letters
+        total_time: Seconds spent generating the board
+        density: Fraction of the cells of the board covered by hidden words
+        overlap: Number of word letters per covered cell (1 if no word shares a
+                 letter with another)
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty WordSearchStats.
+        """
+        self.attempts = {}
+        self.candidates = {}
+        self.evictions = 0
+        self.replaced = 0
+        self.check_time = 0.0
+        self.fill_time = 0.0
+        self.total_time = 0.0
+        self.density = 0.0
+        self.overlap = 0.0
+
+    def on_check(self, word, candidates, elapsed):
+        """
+        Called after the placements of a word that fit the board were found.
+
+        Parameters
+            word: The word being placed
+            candidates: Number of placements that fit the board
+            elapsed: Seconds spent finding them
+        """
+        self.candidates[word] = candidates
+        self.check_time += elapsed
+
+    def on_place(self, word, x, y, ox, oy):
+        """
+        Called after a word was placed on the board.
+
+        Parameters
+            word: The word that was placed
+            x, y: Starting coordinates of the word
+            ox, oy: Step size in the x and y direction
+        """
+        self.attempts[word] = self.attempts.get(word, 0) + 1
+
+    def on_evict(self, word, evicted, elapsed):
+        """
+        Called after words were taken off the board to make room for a word.
+
+        Parameters
+            word: The word that had nowhere to go
+            evicted: List of the words taken off the board
+            elapsed: Seconds spent finding the least blocked placement
+        """
+        self.evictions += 1
+        self.replaced += len(evicted)
+        self.check_time += elapsed
+
+    def on_fill(self, elapsed):
+        """
+        Called after the empty cells of the board were filled with random letters.
+
+        Parameters
+            elapsed: Seconds spent filling the board
+        """
+        self.fill_time += elapsed
+
+    def on_done(self, covered, cells, letters, elapsed):
+        """
+        Called once the board has been generated.
+
+        Parameters
+            covered: Number of cells covered by hidden words
+            cells: Number of cells on the board
+            letters: Total number of letters in the hidden words
+            elapsed: Seconds spent generating the board
+        """
+        self.density = covered / cells
+        self.overlap = letters / covered if covered else 0.0
+        self.total_time = elapsed
+
+    def as_dict(self):
+        """
+        Returns the stats as a dictionary.
+        """
+        return dict(vars(self))
+
+    def __str__(self):
+        """
+        Returns a summary of the stats as a String.
+        """
+        return (
+            f"words placed: {sum(self.attempts.values())} "
+            f"({len(self.attempts)} words), "
+            f"evictions: {self.evictions}, replaced: {self.replaced}, "
+            f"check: {self.check_time * 1000:.1f}ms, "
+            f"fill: {self.fill_time * 1000:.1f}ms, "
+            f"total: {self.total_time * 1000:.1f}ms, "
+            f"density: {self.density:.2f}, overlap: {self.overlap:.2f}"
+        )
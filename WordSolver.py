@@ -0,0 +1,259 @@
+"""
+Solves Word Search boards: finds every word of a dictionary (such as words.txt)
+hidden in a grid of letters, in all 8 directions. The dictionary is compiled
+into a WordScanner automaton once and reused for every grid, so solving a grid
+takes time proportional to its number of cells no matter how large the
+dictionary is.
+
+Grids may be a WordSearch.board (or any 2D list of letters) or plain text with
+one row per line, with or without spaces between the letters. Solutions use the
+same format as WordSearch.solutions, mapping each word to the set of
+(letter, x, y) coordinates of its letters:
+
+solver = WordSolver.load("words.txt")
+solutions = solver.solve(word_search.board)
+for grid, solutions in solve_batch(grids):
+    ...
+
+Alex Eidt
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from WordDictionary import WordDictionary
+from WordScanner import WordScanner
+
+
+# Words shorter than this are not searched for by default. Almost every grid
+# contains many one and two letter words by chance.
+MIN_LENGTH = 3
+
+# Solver used by the worker processes of solve_batch
+_worker_solver = None
+
+
+def parse_grid(text):
+    """
+    Parses a grid of letters written as text.
+
+    Rows are separated by newlines (or by ":::" as in exported HTML files).
+    Letters within a row may be separated by whitespace, as in str(WordSearch),
+    or written next to each other. Blank lines are ignored.
+
+    Parameters
+        text: The grid as a String
+
+    Returns
+        The grid as a 2D list of uppercased letters indexed as grid[y][x].
+
+    Raises
+        ValueError: If the rows do not all have the same length.
+    """
+    rows = []
+    for line in text.replace(":::", "\n").splitlines():
+        letters = line.split()
+        if len(letters) == 1:
+            letters = list(letters[0])
+        if letters:
+            rows.append([letter.upper() for letter in letters])
+
+    if any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("Every row of the grid must have the same length.")
+
+    return rows
+
+
+class WordSolver:
+    """
+    The WordSolver finds the words of a dictionary in grids of letters.
+    """
+
+    # Maps (absolute path, min_length) to the WordSolver loaded for it, checked
+    # against the WordDictionary so a changed file is compiled again
+    _cache = {}
+
+    def __init__(self, words, min_length=MIN_LENGTH):
+        """
+        Compiles a list of words into a WordSolver.
+
+        Parameters
+            words: List of words to search for
+            min_length: Words shorter than this are ignored. Default is MIN_LENGTH.
+        """
+        self.min_length = min_length
+        self._scanner = WordScanner([word for word in words if len(word) >= min_length])
+
+    @classmethod
+    def load(cls, file_name, min_length=MIN_LENGTH):
+        """
+        Loads a WordSolver for the words in a word file. The file is only read
+        and compiled again if it has changed since it was last loaded.
+
+        Parameters
+            file_name: Path of the word file
+            min_length: Words shorter than this are ignored. Default is MIN_LENGTH.
+
+        Returns
+            The WordSolver for the file.
+        """
+        dictionary = WordDictionary.load(file_name)
+        key = (os.path.abspath(file_name), min_length)
+        cached = cls._cache.get(key)
+        if cached is not None and cached[0] is dictionary:
+            return cached[1]
+
+        solver = cls(dictionary.words(), min_length)
+        cls._cache[key] = (dictionary, solver)
+        return solver
+
+    @property
+    def words(self):
+        """
+        The sorted list of words searched for.
+        """
+        return self._scanner.words
+
+    def occurrences(self, grid):
+        """
+        Finds every occurrence of every word in a grid.
+
+        Parameters
+            grid: 2D list of letters indexed as grid[y][x], or the grid as text
+                  (see parse_grid)
+
+        Returns
+            A list of (word, x, y, dx, dy) tuples giving the first cell and
+            direction of each occurrence.
+        """
+        if isinstance(grid, str):
+            grid = parse_grid(grid)
+        return list(self._scanner.occurrences(grid))
+
+    def solve(self, grid):
+        """
+        Finds the words of the dictionary hidden in a grid.
+
+        Parameters
+            grid: 2D list of letters indexed as grid[y][x], or the grid as text
+                  (see parse_grid)
+
+        Returns
+            A dictionary mapping each word found to the set of (letter, x, y)
+            coordinates of its letters. If a word occurs more than once, the
+            first occurrence found is used; see solve_all for every occurrence.
+        """
+        solutions = {}
+        for word, x, y, dx, dy in self.occurrences(grid):
+            if word not in solutions:
+                solutions[word] = _coordinates(word, x, y, dx, dy)
+
+        return solutions
+
+    def starts(self, grid):
+        """
+        Finds where the words of the dictionary hidden in a grid start.
+
+        Returns
+            A dictionary mapping each word found to the (x, y, dx, dy) start and
+            direction of its first occurrence, the one used by solve.
+        """
+        starts = {}
+        for word, x, y, dx, dy in self.occurrences(grid):
+            starts.setdefault(word, (x, y, dx, dy))
+
+        return starts
+
+    def solve_all(self, grid):
+        """
+        Finds every occurrence of the words of the dictionary in a grid.
+
+        Returns
+            A dictionary mapping each word found to a list with one set of
+            (letter, x, y) coordinates per occurrence.
+        """
+        solutions = {}
+        for word, x, y, dx, dy in self.occurrences(grid):
+            solutions.setdefault(word, []).append(_coordinates(word, x, y, dx, dy))
+
+        return solutions
+
+    def solve_many(self, grids):
+        """
+        Solves several grids one after the other with the same compiled
+        dictionary.
+
+        Parameters
+            grids: Iterable of grids (see solve)
+
+        Returns
+            A generator of the solutions of each grid, in order.
+        """
+        for grid in grids:
+            yield self.solve(grid)
+
+
+def _coordinates(word, x, y, dx, dy):
+    """
+    Returns the set of (letter, x, y) coordinates of a word placed at (x, y)
+    with step size (dx, dy).
+    """
+    return {(letter, x + i * dx, y + i * dy) for i, letter in enumerate(word)}
+
+
+def _init_worker(file_name, min_length):
+    """
+    Compiles the dictionary once in each worker process of solve_batch.
+    """
+    global _worker_solver
+    _worker_solver = WordSolver.load(file_name, min_length)
+
+
+def _solve(grid):
+    """
+    Solves a grid in a worker process of solve_batch.
+    """
+    return _worker_solver.solve(grid)
+
+
+def _starts(grid):
+    """
+    Finds the starts of the words in a grid in a worker process of solve_batch.
+    """
+    return _worker_solver.starts(grid)
+
+
+def solve_batch(
+    grids, file_name="words.txt", min_length=MIN_LENGTH, max_workers=None, starts=False
+):
+    """
+    Solves many grids in a pool of worker processes. Each worker compiles the
+    dictionary once and reuses it for every grid it is given.
+
+    Parameters
+        grids: Iterable of grids (see WordSolver.solve)
+        file_name: Path of the word file. Default is "words.txt".
+        min_length: Words shorter than this are ignored. Default is MIN_LENGTH.
+        max_workers: Number of worker processes. Default is None (one per CPU).
+                     With max_workers=1 the grids are solved in this process.
+        starts: If True, the solutions map each word to the start and direction
+                of its first occurrence instead (see WordSolver.starts).
+                Default is False.
+
+    Returns
+        A generator of (grid, solutions) tuples, in the order of grids.
+    """
+    grids = list(grids)
+    if max_workers == 1:
+        solver = WordSolver.load(file_name, min_length)
+        if starts:
+            yield from zip(grids, map(solver.starts, grids))
+        else:
+            yield from zip(grids, solver.solve_many(grids))
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(file_name, min_length),
+    ) as executor:
+        yield from zip(grids, executor.map(_starts if starts else _solve, grids))
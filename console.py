@@ -3,10 +3,30 @@ This script allows the user to start an instance of the WordBoard GUI
 from the command line. The user may also customize their wordboard size,
 color, and which words are put into the word board.
 
+Run without arguments for the interactive prompts. The "generate",
+"benchmark", "solve" and "serve" commands run without prompts or a GUI:
+
+python console.py generate --count 100 --size 20 --format latex
+python console.py generate --words Mercury Venus Earth Mars --seed 7
+python console.py generate --size 1000 --num-words 3000 --tile-size 250
+python console.py benchmark --sizes 16 32 --repeat 10
+python console.py solve grid.txt
+python console.py serve --port 8765
+
 Alex Eidt
 """
 
-from WordBoard import WordBoard
+import argparse
+import asyncio
+from random import Random
+from Benchmark import DISTRIBUTIONS, benchmark, format_results
+from Exporter import EXTENSIONS, export
+from PuzzleCache import PuzzleCache
+from Service import DEFAULT_PORT, serve
+from TiledWordSearch import TiledWordSearch
+from WordDictionary import WordDictionary
+from WordSearch import DIFFICULTIES, FILLERS, WordSearch
+from WordSolver import MIN_LENGTH, parse_grid, solve_batch
 
 
 def main():
@@ -66,8 +86,250 @@ def main():
     file_name = file_name if file_name else "words.txt"
     words = words[:-1] if words[:-1] else None
 
+    # Imported here so that the headless commands do not need tkinter
+    from WordBoard import WordBoard
+
     WordBoard(size=size, color=color, file_name=file_name, words=words)
 
 
+def generate(args):
+    """
+    Generates args.count Word Search boards and exports them into a single file.
+    Boards use the words given in args.words, or random words from args.file.
+    With args.tile_size, each board is generated tile by tile in worker processes.
+    """
+    rng = Random(args.seed)
+    dictionary = None if args.words else WordDictionary.load(args.file)
+    cache = None if args.cache is None else PuzzleCache(args.cache)
+    if args.tile_size is None:
+        board_class, tiling = WordSearch, {}
+    else:
+        board_class = TiledWordSearch
+        tiling = {"tile_size": args.tile_size, "max_workers": args.jobs}
+
+    word_searches = []
+    for _ in range(args.count):
+        words = args.words
+        if words is None:
+            count = args.num_words or rng.choice(range(args.size // 3, args.size))
+            words = dictionary.sample(count, args.size - 4, rng)
+        word_searches.append(
+            board_class(
+                args.size,
+                words,
+                backend=args.backend,
+                timeout=args.timeout,
+                seed=rng.getrandbits(32),
+                filler=args.filler,
+                directions=args.difficulty,
+                cache=cache,
+                **tiling,
+            )
+        )
+
+    file_name = export(
+        word_searches, fmt=args.format, file_name=args.output, directory=args.directory
+    )
+    print(f"Exported {len(word_searches)} boards to {file_name}")
+
+
+def run_benchmark(args):
+    """
+    Runs the generation benchmark and prints the results as a table.
+    """
+    results = benchmark(
+        sizes=args.sizes,
+        word_densities=args.densities,
+        distributions=args.lengths,
+        repeat=args.repeat,
+        seed=args.seed,
+        file_name=args.file,
+        backend=args.backend,
+        timeout=args.timeout,
+        order=args.order,
+        directions=args.difficulty,
+    )
+    print(format_results(results))
+
+
+def solve(args):
+    """
+    Finds the dictionary words hidden in the grids of the given text files and
+    prints them with the cell they start at.
+    """
+    grids = []
+    for file_name in args.grids:
+        with open(file_name, mode="r") as f:
+            grids.append(parse_grid(f.read()))
+
+    results = solve_batch(
+        grids,
+        file_name=args.file,
+        min_length=args.min_length,
+        max_workers=args.jobs,
+        starts=True,
+    )
+    for file_name, (_, starts) in zip(args.grids, results):
+        print(f"{file_name}: {len(starts)} words")
+        for word, (x, y, _, _) in sorted(starts.items()):
+            print(f"  {word} ({x}, {y})")
+
+
+def run_service(args):
+    """
+    Serves board generation over HTTP until interrupted.
+    """
+    print(f"Serving on {args.socket or f'{args.host}:{args.port}'}")
+    try:
+        asyncio.run(
+            serve(
+                args.host,
+                args.port,
+                args.socket,
+                max_workers=args.jobs,
+                timeout=args.timeout,
+                backend=args.backend,
+                directions=args.difficulty,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+def parse_args(argv=None):
+    """
+    Parses the command line arguments for the headless commands.
+    """
+    parser = argparse.ArgumentParser(
+        description="Create Word Search puzzles. Run without a command for the GUI."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--file", default="words.txt", help="Word file random words are chosen from."
+    )
+    common.add_argument("--seed", type=int, default=None, help="Random seed.")
+    common.add_argument(
+        "--backend",
+        choices=["list", "numpy", "bitboard"],
+        default="bitboard",
+        help="Board backend.",
+    )
+    common.add_argument(
+        "--timeout", type=float, default=None, help="Seconds allowed per board."
+    )
+    common.add_argument(
+        "--difficulty",
+        choices=list(DIFFICULTIES),
+        default="medium",
+        help="Directions words are placed in.",
+    )
+
+    parser_generate = commands.add_parser(
+        "generate", parents=[common], help="Generate and export boards."
+    )
+    parser_generate.add_argument("--count", type=int, default=1)
+    parser_generate.add_argument("--size", type=int, default=16)
+    parser_generate.add_argument(
+        "--words", nargs="+", default=None, help="Words to hide in every board."
+    )
+    parser_generate.add_argument(
+        "--num-words", type=int, default=None, help="Number of random words per board."
+    )
+    parser_generate.add_argument(
+        "--filler",
+        choices=list(FILLERS),
+        default="random",
+        help="How cells not covered by words are filled.",
+    )
+    parser_generate.add_argument(
+        "--cache", default=None, help="Directory to cache generated boards in."
+    )
+    parser_generate.add_argument(
+        "--tile-size",
+        type=int,
+        default=None,
+        help="Generate large boards in tiles of this size in parallel.",
+    )
+    parser_generate.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes for --tile-size.",
+    )
+    parser_generate.add_argument("--format", choices=list(EXTENSIONS), default="html")
+    parser_generate.add_argument("--output", default=None, help="File to write.")
+    parser_generate.add_argument(
+        "--directory",
+        default=".",
+        help="Directory to write to if --output is not given.",
+    )
+
+    parser_benchmark = commands.add_parser(
+        "benchmark", parents=[common], help="Benchmark board generation."
+    )
+    parser_benchmark.add_argument("--sizes", type=int, nargs="+", default=[16, 32, 64])
+    parser_benchmark.add_argument(
+        "--densities",
+        type=float,
+        nargs="+",
+        default=[0.5, 1.0, 1.5],
+        help="Words per board as a multiple of the board size.",
+    )
+    parser_benchmark.add_argument(
+        "--lengths",
+        choices=list(DISTRIBUTIONS),
+        nargs="+",
+        default=list(DISTRIBUTIONS),
+        help="Word length distributions.",
+    )
+    parser_benchmark.add_argument("--repeat", type=int, default=20)
+    parser_benchmark.add_argument(
+        "--order",
+        choices=["random", "longest", "constrained"],
+        default="random",
+        help="Order in which words are placed.",
+    )
+
+    parser_solve = commands.add_parser(
+        "solve", help="Find the dictionary words in grids."
+    )
+    parser_solve.add_argument(
+        "--file", default="words.txt", help="Word file of the words to find."
+    )
+    parser_solve.add_argument(
+        "grids", nargs="+", help="Text files with one row of the grid per line."
+    )
+    parser_solve.add_argument("--min-length", type=int, default=MIN_LENGTH)
+    parser_solve.add_argument(
+        "--jobs", type=int, default=1, help="Number of worker processes."
+    )
+
+    parser_serve = commands.add_parser(
+        "serve", parents=[common], help="Serve board generation over HTTP."
+    )
+    parser_serve.add_argument("--host", default="127.0.0.1")
+    parser_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser_serve.add_argument(
+        "--socket", default=None, help="Unix socket to listen on instead of a port."
+    )
+    parser_serve.add_argument(
+        "--jobs", type=int, default=None, help="Number of worker processes."
+    )
+
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.command == "generate":
+        generate(args)
+    elif args.command == "benchmark":
+        run_benchmark(args)
+    elif args.command == "solve":
+        solve(args)
+    elif args.command == "serve":
+        run_service(args)
+    else:
+        main()
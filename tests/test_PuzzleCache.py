@@ -0,0 +1,70 @@
+"""
+Checks that boards stored in a PuzzleCache are read back unchanged.
+
+Alex Eidt
+"""
+
+import os
+import tempfile
+import unittest
+from random import Random
+from time import perf_counter
+from PuzzleCache import PuzzleCache
+from WordDictionary import WordDictionary
+from WordSearch import WordSearch
+
+
+WORDS = ["Mercury", "Venus", "Earth", "Mars", "Jupiter", "Saturn"]
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "words.txt")
+
+
+class TestPuzzleCache(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.cache = PuzzleCache(self._directory.name)
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_round_trip(self):
+        word_search = WordSearch(12, WORDS, seed=3, directions="hard")
+        placements = [
+            (word, *placement[:4])
+            for word, placement in word_search.solutions.placements()
+        ]
+        self.assertTrue(self.cache.put("key", word_search.board, placements))
+        self.assertEqual(self.cache.get("key"), (word_search.board, placements))
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_cached_board_matches_generated(self):
+        generated = WordSearch(12, WORDS, seed=5, cache=self.cache)
+        cached = WordSearch(12, WORDS, seed=5, cache=self.cache)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(cached.board, generated.board)
+        self.assertEqual(
+            dict(cached.solutions.placements()),
+            dict(generated.solutions.placements()),
+        )
+
+    def test_large_hit_is_not_slower_than_miss(self):
+        words = WordDictionary.load(WORDS_FILE).sample(300, 12, Random(0))
+        start = perf_counter()
+        generated = WordSearch(400, words, seed=1, cache=self.cache)
+        miss = perf_counter() - start
+        start = perf_counter()
+        cached = WordSearch(400, words, seed=1, cache=self.cache)
+        hit = perf_counter() - start
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(cached.board, generated.board)
+        self.assertLess(hit, miss)
+
+    def test_damaged_file_is_a_miss(self):
+        with open(os.path.join(self._directory.name, "bad.wsc"), "wb") as f:
+            f.write(b"not a cache file")
+        self.assertIsNone(self.cache.get("bad"))
+
+
+if __name__ == "__main__":
+    unittest.main()
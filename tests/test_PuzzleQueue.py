@@ -0,0 +1,40 @@
+"""
+Checks that cancelling a board in the PuzzleQueue stops the board being built.
+
+Alex Eidt
+"""
+
+import os
+import unittest
+from concurrent.futures import CancelledError
+from random import Random
+from time import perf_counter, sleep
+from PuzzleQueue import PuzzleQueue
+from WordDictionary import WordDictionary
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "words.txt")
+
+
+class TestPuzzleQueue(unittest.TestCase):
+    def setUp(self):
+        self.queue = PuzzleQueue(20, Random(0).random)
+        self.addCleanup(self.queue.shutdown)
+
+    def test_cancel_stops_build(self):
+        # Too many words to fit, so the board takes a while to be given up on
+        words = WordDictionary.load(WORDS_FILE).sample(150, 10, Random(0))
+        future = self.queue.submit(words)
+        while not future.running():
+            sleep(0.01)
+        start = perf_counter()
+        self.queue.cancel(future)
+        self.assertIsInstance(future.exception(timeout=5), CancelledError)
+        self.assertLess(perf_counter() - start, 0.5)
+
+        words, word_search = self.queue.submit(["Mercury", "Venus"]).result(timeout=5)
+        self.assertEqual(sorted(word_search.solutions), ["MERCURY", "VENUS"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Checks Solutions.fewest_blocking against counting the blocking words of every
+placement one cell at a time.
+
+Alex Eidt
+"""
+
+import unittest
+from random import Random
+from WordSearch import WordSearch
+
+
+def brute_force(word_search, word):
+    """
+    Returns the number of words blocking the least blocked placements of a word
+    and the list of those (x, y, ox, oy) placements, in the order of the
+    orientations and then of the starting cells.
+    """
+    counted = []
+    for ox, oy, xs, ys in word_search._get_orientations(len(word)):
+        for y in ys:
+            for x in xs:
+                blocking = word_search._blocking_words(word, x, y, ox, oy)
+                counted.append((len(blocking), (x, y, ox, oy)))
+    fewest = min(blocking for blocking, _ in counted)
+    return fewest, [placement for blocking, placement in counted if blocking == fewest]
+
+
+class TestFewestBlocking(unittest.TestCase):
+    def test_matches_brute_force(self):
+        rng = Random(0)
+        for seed in range(30):
+            size = rng.randint(6, 12)
+            words = [
+                "".join(rng.choice("ABC") for _ in range(rng.randint(2, size - 3)))
+                for _ in range(rng.randint(1, size))
+            ]
+            word_search = WordSearch(
+                size,
+                words,
+                seed=seed,
+                directions=rng.choice(["easy", "medium", "hard"]),
+                placement="overlap",
+            )
+            # The filler letters are taken off so only the words are left
+            word_search._grid.clear()
+            for placed, coords in word_search.solutions.items():
+                for letter, x, y in coords:
+                    word_search._grid.set(x, y, letter)
+            word = "".join(rng.choice("ABCD") for _ in range(rng.randint(2, size - 3)))
+            fewest, placements = word_search.solutions.fewest_blocking(
+                word, word_search._get_orientations(len(word))
+            )
+            with self.subTest(seed=seed, word=word):
+                self.assertEqual(
+                    (fewest, list(placements)), brute_force(word_search, word)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Checks the WordScanner against a brute force search of every cell and direction.
+
+Alex Eidt
+"""
+
+import unittest
+from random import Random
+from WordScanner import WordScanner
+
+
+DIRECTIONS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def brute_force(words, board):
+    """
+    Returns the set of (word, cells) pairs of every occurrence of the words in a
+    board, where cells is the frozenset of the (x, y) cells of the occurrence.
+    """
+    height, width = len(board), len(board[0])
+    found = set()
+    for word in words:
+        for y in range(height):
+            for x in range(width):
+                for dx, dy in DIRECTIONS:
+                    cells = [(x + i * dx, y + i * dy) for i in range(len(word))]
+                    if all(
+                        0 <= i < width and 0 <= j < height and board[j][i] == letter
+                        for (i, j), letter in zip(cells, word)
+                    ):
+                        found.add((word, frozenset(cells)))
+    return found
+
+
+class TestWordScanner(unittest.TestCase):
+    def test_occurrences_match_brute_force(self):
+        rng = Random(0)
+        for _ in range(50):
+            width, height = rng.randint(1, 9), rng.randint(1, 9)
+            board = [[rng.choice("ABC") for _ in range(width)] for _ in range(height)]
+            words = {
+                "".join(rng.choice("ABC") for _ in range(rng.randint(1, 4)))
+                for _ in range(6)
+            }
+            scanner = WordScanner(words)
+            found = [
+                (word, frozenset((x + i * dx, y + i * dy) for i in range(len(word))))
+                for word, x, y, dx, dy in scanner.occurrences(board)
+            ]
+            self.assertEqual(len(found), len(set(found)))
+            self.assertEqual(set(found), brute_force(scanner.words, board))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Checks that the board backends build the same boards for the same seed and
+that sets of words that do not fit are given up on quickly.
+
+Alex Eidt
+"""
+
+import os
+import unittest
+from random import Random
+from time import perf_counter
+from WordDictionary import WordDictionary
+from WordSearch import WordSearch
+
+
+WORDS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "words.txt")
+
+
+class TestBackends(unittest.TestCase):
+    def test_bitboard_matches_list(self):
+        dictionary = WordDictionary.load(WORDS_FILE)
+        for seed in range(20):
+            rng = Random(seed)
+            size = rng.randint(8, 20)
+            words = dictionary.sample(rng.randint(3, size), size - 4, rng)
+            options = {
+                "placement": rng.choice(["uniform", "overlap"]),
+                "order": rng.choice(["random", "longest", "constrained"]),
+                "directions": rng.choice(["easy", "medium", "hard"]),
+                "filler": rng.choice(["random", "safe"]),
+            }
+            boards = [
+                WordSearch(size, words, backend=backend, seed=seed, **options)
+                for backend in ("list", "bitboard")
+            ]
+            with self.subTest(seed=seed, **options):
+                self.assertEqual(boards[0].board, boards[1].board)
+                self.assertEqual(
+                    dict(boards[0].solutions.placements()),
+                    dict(boards[1].solutions.placements()),
+                )
+
+
+class TestNotFitting(unittest.TestCase):
+    def test_too_many_letters(self):
+        words = WordDictionary.load(WORDS_FILE).sample(200, 6, Random(0))
+        with self.assertRaisesRegex(ValueError, "too many letters"):
+            WordSearch(10, words, seed=1)
+
+    def test_eviction_budget(self):
+        words = WordDictionary.load(WORDS_FILE).sample(150, 10, Random(0))
+        start = perf_counter()
+        with self.assertRaises(ValueError):
+            WordSearch(20, words, seed=1)
+        self.assertLess(perf_counter() - start, 30)
+
+    def test_timeout(self):
+        words = WordDictionary.load(WORDS_FILE).sample(150, 10, Random(0))
+        start = perf_counter()
+        with self.assertRaises(TimeoutError):
+            WordSearch(20, words, seed=1, timeout=0.2)
+        self.assertLess(perf_counter() - start, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()